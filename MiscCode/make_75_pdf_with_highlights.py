@@ -1,12 +1,14 @@
 import os
 import pymupdf  # PyMuPDF
-from pypdf import PdfWriter, PdfReader
 import pandas as pd
-import shutil
 import time
-import uuid
+from tqdm import tqdm
 
-def merge_highlighted_pdfs(csv_file, base_path, output_path="highlighted_merged_output.pdf"):
+# Bounding box columns needed to place a highlight
+BBOX_COLUMNS = ['bbx0', 'bby0', 'bbx1', 'bby1']
+
+def merge_highlighted_pdfs(csv_file, base_path, output_path="highlighted_merged_output.pdf", deduped_csv=None,
+                           verbose=False):
     """
     Merge PDFs with highlighted text based on search results.
     
@@ -14,122 +16,108 @@ def merge_highlighted_pdfs(csv_file, base_path, output_path="highlighted_merged_
     csv_file (str): Path to CSV file with search results
     base_path (str): Base directory containing PDFs
     output_path (str): Path for output merged PDF
+    deduped_csv (str): Optional path to save the deduplicated file list
+    verbose (bool): Show a progress bar and per-file progress messages (errors
+                    are always printed)
     
     Returns:
-    tuple: (success_count, failed_pdfs, temp_directory)
+    tuple: (success_count, failed_pdfs)
     """
-    # Create a temporary directory with a unique name
-    temp_dir = f"temp_highlight_pdfs_{uuid.uuid4().hex[:8]}"
-    os.makedirs(temp_dir, exist_ok=True)
-    print(f"Created temporary directory: {temp_dir}")
+    # Read the data; bounding boxes stay float64 to keep their four decimals
+    df_original = pd.read_csv(csv_file, dtype={col: 'float64' for col in BBOX_COLUMNS})
     
-    # Read the data
-    df = pd.read_csv(csv_file)
-    df_original = df.copy()
+    # The bounding box columns are the same for every row, so check them once
+    has_bbox = set(BBOX_COLUMNS) <= set(df_original.columns)
     
-    # Filter and sort data
+    # Filter and sort data, leaving the original frame untouched for highlight lookups
     columns_to_keep = ['filename', 'date', 'page_number']
-    df = df[columns_to_keep]
-    df = df.drop_duplicates()
-    df = df.sort_values(by=['date', 'page_number'])
+    df_unique = (df_original[columns_to_keep]
+                 .drop_duplicates(ignore_index=True)
+                 .sort_values(by=['date', 'page_number'], kind='stable', ignore_index=True))
     
-    # Save deduplicated results
-    deduped_csv = "regex_search_results_deduped.csv"
-    df.to_csv(deduped_csv, index=False)
-    print(f"Saved deduplicated results to {deduped_csv}")
+    # Save deduplicated results if requested
+    if deduped_csv:
+        df_unique.to_csv(deduped_csv, index=False)
+        print(f"Saved deduplicated results to {deduped_csv}")
     
     # Get unique filenames sorted by date and page number
-    pdf_files = df['filename'].unique()
+    pdf_files = df_unique['filename'].unique()
     print(f"Found {len(pdf_files)} PDF files to process and merge")
     
-    # For the final merged PDF
-    merger = PdfWriter()
+    # Rows of each file in the original dataframe, grouped once for the highlight lookups
+    rows_by_file = df_original.groupby('filename', sort=False).indices
+    bboxes = df_original[BBOX_COLUMNS].to_numpy() if has_bbox else None
+    
+    # For the final merged PDF, built directly with PyMuPDF
+    merger = pymupdf.open()
     
     # Track successful and failed operations
     successful = 0
+    highlighted = 0
     failed = []
     
-    # Process each PDF file
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"Processing {i}/{len(pdf_files)}: {pdf_file}")
-        
+    # Process each PDF file; errors are always reported, progress only when verbose
+    for pdf_file in tqdm(pdf_files, desc="Merging PDFs", disable=not verbose):
         try:
             full_path = os.path.join(base_path, pdf_file)
             
-            if not os.path.exists(full_path):
-                print(f"  File not found: {full_path}")
+            # Open the PDF with PyMuPDF, a missing file is reported by open itself
+            try:
+                doc = pymupdf.open(full_path)
+            except (FileNotFoundError, pymupdf.FileNotFoundError):
+                tqdm.write(f"  File not found: {full_path}")
                 failed.append(pdf_file)
                 continue
-                
-            # Find all matching rows for this PDF in the original dataframe
-            matches = df_original[df_original['filename'] == pdf_file]
-            
-            # Sanitize filename for temp file
-            safe_name = pdf_file.replace(" ", "_").replace("/", "_").replace("\\", "_")
-            temp_pdf_path = os.path.join(temp_dir, f"temp_{safe_name}")
             
-            if matches.empty:
-                print(f"  No highlight data found for {pdf_file}, adding without highlights")
-                # For files without highlights, we'll still copy to our temp directory for consistency
-                shutil.copy2(full_path, temp_pdf_path)
-            else:
-                # Open the PDF with PyMuPDF for highlighting
-                doc = pymupdf.open(full_path)
-                
-                # Since each PDF is a single page, we just work with page 0
-                page = doc[0]
+            with doc:
+                # Find all matching rows for this PDF in the original dataframe
+                file_rows = rows_by_file.get(pdf_file)
                 
-                # Track if we made any changes
-                highlights_added = False
-                
-                # Process each match for this file
-                for _, row in matches.iterrows():
-                    # Check if the necessary columns exist for highlighting
-                    if all(col in row.index for col in ['bbx0', 'bby0', 'bbx1', 'bby1']):
-                        try:
-                            # Extract bounding box coordinates
-                            rect = pymupdf.Rect(
-                                float(row['bbx0']), 
-                                float(row['bby0']), 
-                                float(row['bbx1']), 
-                                float(row['bby1'])
-                            )
-                            
-                            # Add highlight annotation
-                            highlight = page.add_highlight_annot(rect)
-                            highlight.set_colors({"stroke": (1, 1, 0)})  # Yellow highlight
-                            highlight.update()
-                            highlights_added = True
-                        except Exception as e:
-                            print(f"  Error highlighting: {str(e)}")
-                
-                # Save the highlighted PDF to our temp directory
-                doc.save(temp_pdf_path)
-                doc.close()
-                
-                if highlights_added:
-                    print(f"  Added {pdf_file} with highlights")
+                if file_rows is None:
+                    if verbose:
+                        tqdm.write(f"  No highlight data found for {pdf_file}, adding without highlights")
                 else:
-                    print(f"  Added {pdf_file} (no highlights were applied)")
-            
-            # Add the file to the merger
-            merger.append(temp_pdf_path)
+                    # Since each PDF is a single page, we just work with page 0
+                    page = doc[0]
+                    
+                    # Track if we made any changes
+                    highlights_added = False
+                    
+                    # Process each match for this file
+                    if has_bbox:
+                        for x0, y0, x1, y1 in bboxes[file_rows].tolist():
+                            try:
+                                # Add highlight annotation
+                                highlight = page.add_highlight_annot(pymupdf.Rect(x0, y0, x1, y1))
+                                highlight.set_colors({"stroke": (1, 1, 0)})  # Yellow highlight
+                                highlight.update()
+                                highlights_added = True
+                            except Exception as e:
+                                tqdm.write(f"  Error highlighting {pdf_file}: {str(e)}")
+                    
+                    if highlights_added:
+                        highlighted += 1
+                
+                # Copy the page, including its annotations, into the merged document
+                merger.insert_pdf(doc)
             successful += 1
                 
         except Exception as e:
-            print(f"  Error processing {pdf_file}: {str(e)}")
+            tqdm.write(f"  Error processing {pdf_file}: {str(e)}")
             failed.append(pdf_file)
     
-    # Write the merged PDF to a file
-    if successful > 0:
-        try:
-            merger.write(output_path)
-            merger.close()
-            print(f"\nSuccessfully merged {successful} PDFs into {output_path}")
-        except Exception as e:
-            print(f"Error writing merged PDF: {str(e)}")
-    else:
-        print("No PDFs were successfully merged")
+    # Write the merged PDF to a file, closing it whether or not that works
+    try:
+        if successful > 0:
+            try:
+                merger.save(output_path, garbage=3, deflate=True)
+                print(f"\nSuccessfully merged {successful} PDFs ({highlighted} with highlights) into {output_path}")
+            except Exception as e:
+                print(f"Error writing merged PDF: {str(e)}")
+        else:
+            print("No PDFs were successfully merged")
+    finally:
+        merger.close()
     
     # Report any failed files
     if failed:
@@ -137,33 +125,7 @@ def merge_highlighted_pdfs(csv_file, base_path, output_path="highlighted_merged_
         for fail in failed:
             print(f"- {fail}")
     
-    # Return information for later cleanup
-    return successful, failed, temp_dir
-
-def cleanup_temp_directory(temp_dir):
-    """
-    Clean up the temporary directory.
-    
-    Parameters:
-    temp_dir (str): Path to temporary directory
-    
-    Returns:
-    bool: True if cleanup was successful
-    """
-    print(f"Cleaning up temporary directory: {temp_dir}")
-    
-    if not os.path.exists(temp_dir):
-        print("Directory doesn't exist.")
-        return True
-    
-    try:
-        shutil.rmtree(temp_dir)
-        print(f"Successfully removed temporary directory: {temp_dir}")
-        return True
-    except Exception as e:
-        print(f"Error cleaning up directory: {str(e)}")
-        print("You may need to manually delete this directory.")
-        return False
+    return successful, failed
 
 # Main execution
 if __name__ == "__main__":
@@ -173,19 +135,6 @@ if __name__ == "__main__":
     output_path = "highlighted_merged_output.pdf"
     
     print("Starting PDF processing and merging...")
-    successful, failed, temp_dir = merge_highlighted_pdfs(csv_file, base_path, output_path)
-    
-    # Ask user if they want to clean up now
-    if os.path.exists(temp_dir):
-        print("\nTemporary files are stored in:", temp_dir)
-        user_input = input("Do you want to clean up temporary files now? (y/n): ")
-        
-        if user_input.lower() in ['y', 'yes']:
-            cleanup_temp_dir = cleanup_temp_directory(temp_dir)
-            if not cleanup_temp_dir:
-                print(f"To clean up later, run: cleanup_temp_directory('{temp_dir}')")
-        else:
-            print("Temporary files were kept.")
-            print(f"To clean up later, run: cleanup_temp_directory('{temp_dir}')")
+    successful, failed = merge_highlighted_pdfs(csv_file, base_path, output_path, verbose=True)
     
     print("Process complete.")
\ No newline at end of file
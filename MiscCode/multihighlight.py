@@ -2,7 +2,6 @@ import pandas as pd
 import pymupdf  # PyMuPDF
 import os
 import sys
-from pypdf import PdfWriter
 
 def highlight_search_results(search_results_csv, output_pdf_path, base_folder):
     """
@@ -19,63 +18,50 @@ def highlight_search_results(search_results_csv, output_pdf_path, base_folder):
     # Sort by date and page number for a logical order
     df = df.sort_values(by=['date', 'page_number'])
     
-    # Create a PDF writer for the output file
-    pdf_writer = PdfWriter()
+    # Highlighted pages are copied straight into one output document
+    output_doc = pymupdf.open()
     
-    # Keep track of processed files to avoid duplicates
+    # Keep track of processed files
     processed_files = set()
     
-    # Process each row in the search results
-    for index, row in df.iterrows():
-        pdf_path = os.path.join(base_folder, row['filename'])
-        
-        # Check if the file exists
-        if not os.path.exists(pdf_path):
-            print(f"Warning: File not found: {pdf_path}")
-            continue
-        
-        # Create a unique identifier for this page
-        file_id = (pdf_path, 0)  # Assuming single-page PDFs; page number is always 0
-        
-        # Skip if we've already processed this page
-        if file_id in processed_files:
-            continue
-        
-        try:
-            # Open the PDF and highlight the text
-            doc = pymupdf.open(pdf_path)
-            page = doc[0]  # Single-page PDFs
-            
-            # Create a rectangle from the bounding box coordinates
-            rect = pymupdf.Rect(row['bbx0'], row['bby0'], row['bbx1'], row['bby1'])
-            
-            # Add highlight annotation
-            highlight = page.add_highlight_annot(rect)
+    try:
+        # Rows are grouped per file so each PDF is opened and copied once
+        for filename, file_rows in df.groupby('filename', sort=False):
+            pdf_path = os.path.join(base_folder, filename)
             
-            # Create a temporary highlighted PDF
-            temp_path = f"_tmp_{index}.pdf"
-            doc.save(temp_path, incremental=False)
-            doc.close()
+            # Check if the file exists
+            if not os.path.exists(pdf_path):
+                print(f"Warning: File not found: {pdf_path}")
+                continue
             
-            # Add the temporary PDF to our output PDF
-            pdf_writer.append(temp_path)
-            
-            # Mark this page as processed
-            processed_files.add(file_id)
-            
-            print(f"Highlighted text in {row['filename']} at position {rect}")
-            
-        except Exception as e:
-            print(f"Error processing {pdf_path}: {e}")
-    
-    # Save the final PDF
-    pdf_writer.write(output_pdf_path)
-    
-    # Clean up temporary files
-    for index in range(len(df)):
-        temp_path = f"_tmp_{index}.pdf"
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+            try:
+                # Open the PDF and highlight the text
+                with pymupdf.open(pdf_path) as doc:
+                    page = doc[0]  # Single-page PDFs
+                    
+                    # Add a highlight annotation for every match on this page
+                    for _, row in file_rows.iterrows():
+                        rect = pymupdf.Rect(row['bbx0'], row['bby0'], row['bbx1'], row['bby1'])
+                        page.add_highlight_annot(rect)
+                    
+                    # Add the highlighted page to our output PDF without an intermediate save
+                    output_doc.insert_pdf(doc)
+                
+                # Mark this page as processed
+                processed_files.add(pdf_path)
+                
+                print(f"Highlighted {len(file_rows)} matches in {filename}")
+                
+            except Exception as e:
+                print(f"Error processing {pdf_path}: {e}")
+        
+        # Save the final PDF (PyMuPDF cannot save a document without pages)
+        if not processed_files:
+            print("No pages were highlighted. No output PDF created.")
+            return
+        output_doc.save(output_pdf_path, garbage=3, deflate=True)
+    finally:
+        output_doc.close()
     
     print(f"Created PDF with {len(processed_files)} highlighted pages at: {output_pdf_path}")
     
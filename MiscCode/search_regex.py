@@ -6,6 +6,158 @@ from pypdf import PdfWriter
 import argparse
 import glob
 import re
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Hyperscan is optional; when available it replaces the re-based chunk scan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Number of CSV rows handed to each worker process
+CSV_CHUNK_SIZE = 250_000
+
+# Chunks handed to the workers before the oldest one is collected; bounds how
+# much of the CSV is held in memory at once
+MAX_CHUNKS_IN_FLIGHT = 2 * (os.cpu_count() or 1)
+
+# Common OCR confusions, used to build the high fuzziness pattern
+OCR_SUBSTITUTIONS = {
+    'o': '[o0]', 'O': '[O0]',
+    'i': '[i1l|]', 'I': '[I1l|]',
+    'l': '[l1I|]', 'L': '[Ll1|]',
+    '0': '[0Oo]',
+    '1': '[1Il|]',
+    's': '[sS5]', 'S': '[Ss5]',
+    '5': '[5Ss]',
+    'z': '[z2]', 'Z': '[Z2]',
+    '2': '[2Zz]',
+    'n': '[nrh]', 'r': '[rn]', 'h': '[hn]',
+    'm': '[mnn]'
+}
+OCR_PATTERN = re.compile('|'.join(map(re.escape, OCR_SUBSTITUTIONS)))
+
+def compile_hyperscan_database(pattern_sources, flags):
+    """
+    Compiles the pattern sources into a Hyperscan database.
+    
+    Patterns are compiled in UTF-8 mode with Unicode properties, so caseless
+    matching and classes like \\s follow Unicode the way re does.
+    """
+    hs_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    if flags & re.IGNORECASE:
+        hs_flags |= hyperscan.HS_FLAG_CASELESS
+    
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[source.encode('utf-8') for source in pattern_sources],
+        ids=list(range(len(pattern_sources))),
+        flags=[hs_flags] * len(pattern_sources)
+    )
+    return db
+
+# Patterns compiled once in each worker process by init_worker
+worker_patterns = []
+worker_database = None
+
+def init_worker(pattern_sources, flags, use_hyperscan):
+    """
+    Compiles the patterns once when a worker process starts.
+    
+    Patterns are passed as source strings, since compiled patterns do not
+    pickle reliably across platforms.
+    """
+    global worker_patterns, worker_database
+    worker_patterns = [re.compile(source, flags) for source in pattern_sources]
+    worker_database = compile_hyperscan_database(pattern_sources, flags) if use_hyperscan else None
+
+def hyperscan_mask(texts, db, pattern_count):
+    """
+    Returns a boolean array with one row per pattern and one column per text,
+    marking the texts each pattern of the Hyperscan database matches.
+    """
+    mask = np.zeros((pattern_count, len(texts)), dtype=bool)
+    
+    def on_match(pattern_id, start, end, match_flags, row):
+        mask[pattern_id, row] = True
+    
+    for row, text in enumerate(texts):
+        if isinstance(text, str):
+            db.scan(text.encode('utf-8'), match_event_handler=on_match, context=row)
+    
+    return mask
+
+def match_chunk(texts):
+    """
+    Returns a boolean array with one row per pattern and one column per text,
+    marking the texts of a CSV chunk each of the worker's patterns matches.
+    
+    Only the text column is sent to the worker.
+    """
+    if worker_database is not None:
+        return hyperscan_mask(texts.values, worker_database, len(worker_patterns))
+    
+    mask = np.zeros((len(worker_patterns), len(texts)), dtype=bool)
+    for pattern_id, pattern in enumerate(worker_patterns):
+        mask[pattern_id] = texts.str.contains(pattern, na=False).to_numpy(dtype=bool)
+    return mask
+
+def scan_csv(csv_file, pattern_sources, flags=re.IGNORECASE, chunksize=CSV_CHUNK_SIZE):
+    """
+    Filters a text position CSV by regex, scanning chunks in parallel processes.
+    
+    With a single pattern, the matching rows are returned in file order. With
+    several, the rows matching the first pattern come first, followed by those
+    matching each later pattern, and rows repeating an earlier one are dropped.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    pattern_sources (list): Regex source strings; a row matching any of them is kept
+    flags (int): Flags used to compile the patterns
+    chunksize (int): Number of rows per chunk
+    
+    Returns:
+    DataFrame: Matching rows
+    """
+    # Check that Hyperscan accepts the patterns here, so a fallback to re is
+    # reported once rather than by every worker
+    use_hyperscan = hyperscan is not None
+    if use_hyperscan:
+        try:
+            compile_hyperscan_database(pattern_sources, flags)
+        except hyperscan.error as e:
+            print(f"Hyperscan could not compile the pattern, using re instead: {e}")
+            use_hyperscan = False
+    
+    pattern_matches = [[] for _ in pattern_sources]
+    in_flight = deque()
+    
+    def collect_oldest():
+        chunk, future = in_flight.popleft()
+        for matches, mask in zip(pattern_matches, future.result()):
+            matches.append(chunk[mask])
+    
+    with ProcessPoolExecutor(initializer=init_worker,
+                             initargs=(pattern_sources, flags, use_hyperscan)) as executor:
+        for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+            if len(in_flight) >= MAX_CHUNKS_IN_FLIGHT:
+                collect_oldest()
+            in_flight.append((chunk, executor.submit(match_chunk, chunk['text'])))
+        
+        while in_flight:
+            collect_oldest()
+    
+    if not pattern_matches[0]:
+        return pd.DataFrame()
+    
+    search_results = [pd.concat(matches) for matches in pattern_matches]
+    if len(search_results) == 1:
+        return search_results[0]
+    
+    # Combine results, remove duplicates
+    return pd.concat(search_results).drop_duplicates()
 
 def search_and_highlight(search_term, base_folder, output_directory='.', fuzzy_level=1):
     """
@@ -17,62 +169,38 @@ def search_and_highlight(search_term, base_folder, output_directory='.', fuzzy_l
     output_directory (str): Directory where to save output files
     fuzzy_level (int): Level of fuzziness (0=exact, 1=moderate, 2=high)
     """
-    # Step 1: Get text position data
-    try:
-        df = pd.read_csv('big_text_with_position.csv')
-    except FileNotFoundError:
-        print("Error: big_text_with_position.csv not found")
-        return
-    
-    # Step 2: Create a fuzzy search pattern based on the fuzzy level
+    # Step 1: Create a fuzzy search pattern based on the fuzzy level
     if fuzzy_level == 0:
         # Exact search (case-insensitive)
-        pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-        search_results = df[df['text'].str.contains(pattern, na=False)]
+        pattern_sources = [re.escape(search_term)]
     elif fuzzy_level == 1:
         # Moderate fuzzy search - allow for some character spacing variations
         # This creates a pattern where spaces are optional and characters can have optional spaces between them
         escaped_term = re.escape(search_term)
         flexible_spaces = escaped_term.replace(r'\ ', '\\s*')  # Make spaces flexible
-        pattern = re.compile(flexible_spaces, re.IGNORECASE)
-        search_results = df[df['text'].str.contains(pattern, regex=True, na=False)]
+        pattern_sources = [flexible_spaces]
     else:
         # High fuzzy search - use more advanced techniques
         # First try with flexible spacing
         escaped_term = re.escape(search_term)
         flexible_spaces = escaped_term.replace(r'\ ', '\\s*')
-        pattern = re.compile(flexible_spaces, re.IGNORECASE)
-        primary_results = df[df['text'].str.contains(pattern, regex=True, na=False)]
         
         # Then look for words with similar characters (common OCR confusions)
-        # Create alternative patterns with common OCR substitutions
-        ocr_substitutions = {
-            'o': '[o0]', 'O': '[O0]',
-            'i': '[i1l|]', 'I': '[I1l|]',
-            'l': '[l1I|]', 'L': '[Ll1|]',
-            '0': '[0Oo]',
-            '1': '[1Il|]',
-            's': '[sS5]', 'S': '[Ss5]',
-            '5': '[5Ss]',
-            'z': '[z2]', 'Z': '[Z2]',
-            '2': '[2Zz]',
-            'n': '[nrh]', 'r': '[rn]', 'h': '[hn]',
-            'm': '[mnn]'
-        }
-        
-        fuzzy_term = search_term
-        for char, replacements in ocr_substitutions.items():
-            fuzzy_term = fuzzy_term.replace(char, replacements)
+        # Each character is swapped for its substitution group in a single pass
+        fuzzy_term = OCR_PATTERN.sub(lambda m: OCR_SUBSTITUTIONS[m.group(0)], search_term)
         
         # Make spaces optional in the fuzzy pattern
         fuzzy_term = fuzzy_term.replace(' ', '\\s*')
-        fuzzy_pattern = re.compile(fuzzy_term, re.IGNORECASE)
         
-        # Get additional results with the fuzzy pattern
-        secondary_results = df[df['text'].str.contains(fuzzy_pattern, regex=True, na=False)]
-        
-        # Combine results, remove duplicates
-        search_results = pd.concat([primary_results, secondary_results]).drop_duplicates()
+        # Rows matching either pattern are combined in a single scan
+        pattern_sources = [flexible_spaces, fuzzy_term]
+    
+    # Step 2: Scan the text position data
+    try:
+        search_results = scan_csv('big_text_with_position.csv', pattern_sources, re.IGNORECASE)
+    except FileNotFoundError:
+        print("Error: big_text_with_position.csv not found")
+        return
     
     if len(search_results) == 0:
         print(f"No results found for '{search_term}'")
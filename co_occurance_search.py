@@ -6,11 +6,51 @@ import sys
 import glob
 import argparse
 import datetime
-from rapidfuzz import fuzz, process
-from tqdm import tqdm
-import pymupdf  # PyMuPDF
-from pypdf import PdfWriter
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import operator
+import numpy as np
 from pdf_highlighter import highlight_search_results
+from text_positions import read_text_positions, text_positions_parquet, positions_by_file, nearest_negation_distances
+
+# Copy-on-Write lets the frames derived below share memory with their source
+# until they are modified (always enabled from pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# PyArrow is optional; when available, cached Parquet copies are scanned with the
+# term filter pushed down so only candidate rows reach pandas
+try:
+    import pyarrow.dataset as ds
+    import pyarrow.compute as pc
+except ImportError:
+    ds = None
+
+# Aho-Corasick is optional; when available it finds all terms in a single pass
+# over each text instead of one regex scan per term
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Per-user cache directory (%LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or
+# ~/.cache elsewhere), so caches do not depend on where the script is started
+CACHE_DIRECTORY = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    or os.path.join(os.path.expanduser('~'), '.cache'),
+    'PDF_Search_highlight'
+)
+
+# Size the cached co-occurrence searches are trimmed back to, oldest first
+CO_OCCURRENCE_CACHE_LIMIT = '500M'
+
+# joblib is optional; when available, whole co-occurrence searches are cached on
+# disk so repeated CLI runs with the same arguments skip the search entirely
+try:
+    from joblib import Memory
+    memory = Memory(os.path.join(CACHE_DIRECTORY, 'co_occurrence'), verbose=0)
+except ImportError:
+    memory = None
 
 def load_terms_from_file(file_path):
     """
@@ -20,12 +60,14 @@ def load_terms_from_file(file_path):
     file_path (str): Path to the file containing search terms
     
     Returns:
-    list: List of search terms
+    list: List of unique search terms, in file order
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            # Read terms, strip whitespace, and filter out empty lines
-            terms = [line.strip() for line in f if line.strip()]
+            data = f.read()
+        
+        # Strip whitespace, filter out empty lines and drop repeated terms
+        terms = list(dict.fromkeys(filter(None, map(str.strip, data.splitlines()))))
         
         if not terms:
             print(f"Warning: No terms found in file {file_path}")
@@ -37,9 +79,230 @@ def load_terms_from_file(file_path):
         print(f"Error loading terms from {file_path}: {str(e)}")
         return []
 
-def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text_with_position_may12.csv', 
-                                 negation_terms=None, negation_distance=100, 
-                                 start_date=None, end_date=None):
+def scan_text_positions(csv_file, terms, filenames=None):
+    """
+    Load only the rows whose text contains at least one of the terms.
+    
+    The substring filter is pushed down into a PyArrow scan of the cached Parquet
+    copy, so rows without any term never become pandas objects. The filter is a
+    case-insensitive superset of the whole-word matches; callers still apply
+    find_term_matches. Without PyArrow or a Parquet copy (e.g. on the first call
+    for a CSV) the full data is loaded instead.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    terms (list): Every term the caller will look for, including negation terms
+    filenames (set): Only scan rows from these files (optional; a pushdown hint,
+                     the full data may still be returned)
+    
+    Returns:
+    DataFrame: Text position data containing at least the rows matching any term
+    int: Total number of text entries in the data
+    """
+    csv_mtime = os.path.getmtime(csv_file)
+    parquet_file = text_positions_parquet(csv_file)
+    
+    if ds is None or not terms or not (
+            os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= csv_mtime):
+        df = read_text_positions(csv_file, csv_mtime)
+        return df, len(df)
+    
+    dataset = ds.dataset(parquet_file, format='parquet')
+    text_filter = functools.reduce(operator.or_, [
+        pc.match_substring(pc.field('text'), term, ignore_case=True) for term in terms
+    ])
+    if filenames is not None:
+        text_filter &= pc.field('filename').isin(list(filenames))
+    
+    return dataset.to_table(filter=text_filter).to_pandas(), dataset.count_rows()
+
+def term_index_key(term):
+    """
+    Key under which a term's pages are stored in the term page index.
+    """
+    return 'term:' + term.lower()
+
+@functools.lru_cache(maxsize=1)
+def read_term_page_index(csv_file, csv_mtime):
+    """
+    Create the in-memory index of the pages each term appears on in a CSV.
+    
+    Each 'term:<term>' entry holds (match count, pages in data order) and the
+    'total_entries' entry the size of the data. Searches fill it in as they
+    scan new terms; the CSV modification time is part of the cache key, so
+    editing the CSV starts a new index.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    csv_mtime (float): Modification time of csv_file
+    
+    Returns:
+    dict: The term page index, shared between searches of the same CSV
+    """
+    return {}
+
+def load_term_page_index(csv_file):
+    """
+    Load the term page index of a CSV, reusing it while the CSV is unchanged.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    
+    Returns:
+    dict: The term page index, as created by read_term_page_index
+    """
+    return read_term_page_index(csv_file, os.path.getmtime(csv_file))
+
+@functools.lru_cache(maxsize=None)
+def compile_terms_pattern(terms):
+    """
+    Compile a case-insensitive pattern matching any of the terms as a whole word.
+    
+    Parameters:
+    terms (tuple): Terms to match (a tuple so the compiled pattern can be cached)
+    
+    Returns:
+    Pattern: Compiled regular expression
+    """
+    return re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
+def build_terms_automaton(terms):
+    """
+    Build an Aho-Corasick automaton over the lowercased terms.
+    
+    Parameters:
+    terms (tuple): Terms to match (a tuple so the automaton can be cached)
+    
+    Returns:
+    Automaton: Maps each lowercased term to (length, indices of the terms it came from)
+    """
+    term_indices = {}
+    for term_index, term in enumerate(terms):
+        term_indices.setdefault(term.lower(), []).append(term_index)
+    
+    automaton = ahocorasick.Automaton()
+    for word, indices in term_indices.items():
+        automaton.add_word(word, (len(word), indices))
+    automaton.make_automaton()
+    
+    return automaton
+
+def is_word_char(char):
+    """
+    Check whether a character counts as a word character for regex \\b.
+    """
+    return char.isalnum() or char == '_'
+
+def aho_corasick_term_mask(texts, terms):
+    """
+    Find which terms occur as whole words in each text with one automaton pass per text.
+    
+    Word boundaries are checked on the characters around each match the same way
+    \\b does: a boundary lies between a word and a non-word character.
+    
+    Parameters:
+    texts (Series): Text values to scan
+    terms (list): Terms to search for
+    
+    Returns:
+    ndarray: Boolean array with one row per text and one column per term
+    """
+    automaton = build_terms_automaton(tuple(terms))
+    mask = np.zeros((len(texts), len(terms)), dtype=bool)
+    
+    for row, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        
+        text = text.lower()
+        for end, (length, indices) in automaton.iter(text):
+            start = end - length + 1
+            starts_word = is_word_char(text[start])
+            ends_word = is_word_char(text[end])
+            
+            before = is_word_char(text[start - 1]) if start > 0 else False
+            after = is_word_char(text[end + 1]) if end + 1 < len(text) else False
+            
+            if before != starts_word and after != ends_word:
+                mask[row, indices] = True
+    
+    return mask
+
+def rows_containing(df, term):
+    """
+    Select the rows whose text contains the term as a whole word.
+    
+    A plain case-insensitive substring test runs over every row first; the
+    word-boundary regex is only applied to the few rows that contain the term.
+    
+    Parameters:
+    df (DataFrame): Text position data with a 'text' column
+    term (str): Term to search for
+    
+    Returns:
+    DataFrame: Rows containing the term
+    """
+    substring_rows = df[df['text'].str.contains(term, case=False, regex=False, na=False)]
+    return substring_rows[substring_rows['text'].str.contains(compile_terms_pattern((term,)), na=False)]
+
+def find_term_matches(df, terms):
+    """
+    Find the rows containing each term as a whole word.
+    
+    With Aho-Corasick available, each text is scanned once for all terms at once.
+    Otherwise each term is looked up with rows_containing, one thread per term.
+    
+    Parameters:
+    df (DataFrame): Text position data with a 'text' column
+    terms (list): Terms to search for
+    
+    Returns:
+    dict: Mapping of each term to a DataFrame of the rows containing it
+    """
+    if ahocorasick is not None:
+        mask = aho_corasick_term_mask(df['text'], terms)
+        return {term: df[mask[:, term_index]] for term_index, term in enumerate(terms)}
+    
+    with ThreadPoolExecutor() as executor:
+        term_rows = executor.map(functools.partial(rows_containing, df), terms)
+        return dict(zip(terms, term_rows))
+
+def co_occurrence_sort_order(search_results):
+    """
+    Order results by filename, page, descending co-occurrence count and term.
+    
+    The four sort keys are turned into non-negative integer codes and packed into
+    a single int64 key, so one stable argsort replaces a multi-column sort. If the
+    codes do not fit in 63 bits, they are sorted with np.lexsort instead.
+    
+    Parameters:
+    search_results (DataFrame): Co-occurrence results
+    
+    Returns:
+    ndarray: Row positions in sorted order
+    """
+    counts = search_results['co_occurring_terms_count'].to_numpy(dtype='int64')
+    sort_codes = [
+        pd.factorize(search_results['filename'], sort=True)[0].astype('int64'),
+        # Missing page numbers get the last code, so they sort after the rest
+        pd.factorize(search_results['page_number'], sort=True, use_na_sentinel=False)[0].astype('int64'),
+        counts.max() - counts,
+        pd.factorize(search_results['search_term'], sort=True)[0].astype('int64'),
+    ]
+    code_bits = [int(codes.max()).bit_length() for codes in sort_codes]
+    
+    if sum(code_bits) > 63 or min(codes.min() for codes in sort_codes) < 0:
+        return np.lexsort(sort_codes[::-1])
+    
+    sort_key = np.zeros(len(search_results), dtype='int64')
+    for codes, bits in zip(sort_codes, code_bits):
+        sort_key = (sort_key << bits) | codes
+    
+    return np.argsort(sort_key, kind='stable')
+
+def find_co_occurrences(terms, min_terms_required, csv_file, negation_terms, negation_distance,
+                        start_date, end_date, csv_mtime=None):
     """
     Searches for co-occurrence of multiple terms on the same page.
     
@@ -51,6 +314,7 @@ def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text
     negation_distance (float): Maximum distance to consider for negation
     start_date (str): Start date in YYYY-MM-DD format to filter results
     end_date (str): End date in YYYY-MM-DD format to filter results
+    csv_mtime (float): Modification time of csv_file; only used as part of the cache key
     
     Returns:
     DataFrame: Search results with position data for co-occurring terms
@@ -64,68 +328,51 @@ def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text
     if negation_terms and not isinstance(negation_terms, list):
         negation_terms = [negation_terms]
     
-    # Step 1: Get text position data
+    all_terms = terms + (negation_terms or [])
+    
+    # Step 1: Look up the pages each term appears on, scanning the data only for
+    # terms that earlier searches have not indexed yet
+    df = None
     try:
-        df = pd.read_csv(csv_file)
-        search_stats = f"Loaded {len(df)} text entries from CSV file"
+        page_index = load_term_page_index(csv_file)
+        if not all(term_index_key(term) in page_index for term in all_terms):
+            df, page_index['total_entries'] = scan_text_positions(csv_file, all_terms)
+            term_rows = find_term_matches(df, terms)
+            negation_rows = find_term_matches(df, negation_terms) if negation_terms else {}
+            
+            for term, rows in {**term_rows, **negation_rows}.items():
+                pages = zip(rows['filename'].tolist(), rows['page_number'].tolist())
+                page_index[term_index_key(term)] = (len(rows), tuple(dict.fromkeys(pages)))
+        
+        total_entries = page_index['total_entries']
+        indexed_terms = {term: page_index[term_index_key(term)] for term in all_terms}
     except FileNotFoundError:
         return None, f"Error: {csv_file} not found"
     
-    # Step 2: Search for each term individually
+    search_stats = f"Loaded {total_entries} text entries from CSV file"
+    
+    # Step 2: Report the matches for each term
     search_stats += f"\nSearching for co-occurrence of terms: {', '.join(terms)}"
     search_stats += f"\nRequiring at least {min_terms_required} of {len(terms)} terms to be present on a page"
     
-    # Store matches for each term
-    term_matches = {}
-    term_match_counts = {}
-    
-    # Find all matches for each term
-    for term in terms:
-        # Search for exact matches
-        exact_matches = df[df['text'].str.contains(r'\b' + re.escape(term) + r'\b', 
-                                                 case=False, na=False, regex=True)].copy()
-        
-        exact_matches['search_term'] = term
-        exact_matches['match_type'] = 'exact'
-        
-        term_matches[term] = exact_matches
-        term_match_counts[term] = len(exact_matches)
-        
-        search_stats += f"\n- Found {len(exact_matches)} matches for term '{term}'"
+    for term in dict.fromkeys(terms):
+        search_stats += f"\n- Found {indexed_terms[term][0]} matches for term '{term}'"
     
     # Step 3: Find pages with co-occurrences
-    # Create groups by filename and page
-    unique_pages = set()
-    
-    for term, matches in term_matches.items():
-        if not matches.empty:
-            # Extract unique filename/page combinations
-            page_identifiers = matches[['filename', 'page_number']].drop_duplicates()
-            for _, row in page_identifiers.iterrows():
-                unique_pages.add((row['filename'], row['page_number']))
+    # Terms present on each page, in the order they were searched
+    page_term_counts = {}
+    for term in dict.fromkeys(terms):
+        for page in indexed_terms[term][1]:
+            page_term_counts.setdefault(page, []).append(term)
     
-    search_stats += f"\nFound {len(unique_pages)} unique pages with at least one term"
+    search_stats += f"\nFound {len(page_term_counts)} unique pages with at least one term"
     
     # Check each page for the required number of terms
-    qualifying_pages = []
-    page_term_counts = {}
-    
-    for filename, page_number in unique_pages:
-        # Count how many of our search terms appear on this page
-        terms_present = []
-        
-        for term, matches in term_matches.items():
-            page_matches = matches[(matches['filename'] == filename) & 
-                                   (matches['page_number'] == page_number)]
-            
-            if not page_matches.empty:
-                terms_present.append(term)
-        
-        terms_count = len(terms_present)
-        page_term_counts[(filename, page_number)] = terms_present
-        
-        if terms_count >= min_terms_required:
-            qualifying_pages.append((filename, page_number, terms_count, terms_present))
+    qualifying_pages = [
+        (filename, page_number, len(terms_present), terms_present)
+        for (filename, page_number), terms_present in page_term_counts.items()
+        if len(terms_present) >= min_terms_required
+    ]
     
     search_stats += f"\nFound {len(qualifying_pages)} pages with at least {min_terms_required} terms"
     
@@ -133,91 +380,67 @@ def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text
     if not qualifying_pages:
         return None, search_stats + f"\nNo pages found with at least {min_terms_required} terms co-occurring"
     
-    # Step 4: Collect all matches from qualifying pages
-    all_qualifying_matches = []
-    
-    for filename, page_number, terms_count, terms_present in qualifying_pages:
-        for term in terms_present:
-            page_matches = term_matches[term][
-                (term_matches[term]['filename'] == filename) & 
-                (term_matches[term]['page_number'] == page_number)
-            ]
-            all_qualifying_matches.append(page_matches)
-    
-    # Combine all matches
-    search_results = pd.concat(all_qualifying_matches) if all_qualifying_matches else pd.DataFrame()
-    
-    # Add co-occurrence metadata
-    search_results = search_results.copy()
-    search_results['co_occurring_terms_count'] = search_results.apply(
-        lambda row: len(page_term_counts.get((row['filename'], row['page_number']), [])), 
-        axis=1
-    )
+    # Only rows from files with qualifying pages are needed from here on
+    qualifying_files = {filename for filename, _, _, _ in qualifying_pages}
+    if df is None:
+        df, _ = scan_text_positions(csv_file, all_terms, filenames=qualifying_files)
+        term_rows = find_term_matches(df, terms)
     
-    search_results['co_occurring_terms'] = search_results.apply(
-        lambda row: ", ".join(page_term_counts.get((row['filename'], row['page_number']), [])),
-        axis=1
+    # Store matches for each term
+    term_matches = {
+        term: exact_matches.assign(search_term=term, match_type='exact')
+        for term, exact_matches in term_rows.items()
+    }
+    
+    # Step 4: Collect all matches from qualifying pages with a single page filter
+    all_matches = pd.concat(term_matches.values())
+    page_keys = pd.MultiIndex.from_arrays([all_matches['filename'], all_matches['page_number']])
+    qualifying_keys = pd.MultiIndex.from_tuples(
+        [(filename, page_number) for filename, page_number, _, _ in qualifying_pages]
     )
+    on_qualifying_page = page_keys.isin(qualifying_keys)
+    
+    search_results = all_matches[on_qualifying_page]
+    page_keys = page_keys[on_qualifying_page]
+    
+    # Add co-occurrence metadata, looked up by (filename, page_number) for all rows at once
+    counts_map = {page: len(page_terms) for page, page_terms in page_term_counts.items()}
+    terms_map = {page: ", ".join(page_terms) for page, page_terms in page_term_counts.items()}
+    
+    search_results['co_occurring_terms_count'] = page_keys.map(counts_map).to_numpy()
+    search_results['co_occurring_terms'] = page_keys.map(terms_map).to_numpy()
     
     # Apply negation filtering if negation terms are provided
     if negation_terms and len(negation_terms) > 0 and len(search_results) > 0:
         search_stats += f"\nChecking for negation terms near matches..."
         
         # Create a dictionary to track negation matches by term
-        negation_matches_dict = {}
+        negation_locations = {}
         total_negation_matches = 0
         
-        # Find occurrences of each negation term
-        for term in negation_terms:
-            if 'text' in df.columns:
-                # Use word boundaries to match whole words only
-                pattern = r'\b' + re.escape(term) + r'\b'
-                term_matches = df[df['text'].str.contains(pattern, case=False, na=False, regex=True)].copy()
-                negation_matches_dict[term] = term_matches
-                total_negation_matches += len(term_matches)
-                search_stats += f"\n  - Found {len(term_matches)} occurrences of negation term '{term}'"
+        # Find occurrences of each negation term (whole words only); the counts
+        # cover the whole corpus, the rows only the files with results
+        if 'text' in df.columns:
+            for term, term_matches in find_term_matches(df, negation_terms).items():
+                negation_locations[term] = positions_by_file(term_matches)
+                total_negation_matches += indexed_terms[term][0]
+                search_stats += f"\n  - Found {indexed_terms[term][0]} occurrences of negation term '{term}'"
         
         if total_negation_matches > 0:
             search_stats += f"\nFound {total_negation_matches} total occurrences of all negation terms"
             
-            # For each search result, check if any negation term is nearby
-            results_to_keep = []
-            excluded_by_term = {term: 0 for term in negation_terms}
+            # For each search result, find the closest negation term in range
+            distances = nearest_negation_distances(search_results, negation_locations, negation_distance)
+            excluded = distances.min(axis=1) <= negation_distance
+            excluding_term = distances.argmin(axis=1)
             
-            for idx, row in search_results.iterrows():
-                filename = row['filename']
-                x1, y1 = row['bbx0'], row['bby0']
-                
-                # Check if any negation term is too close
-                has_nearby_negation = False
-                excluding_term = None
-                min_distance = float('inf')
-                
-                # Process each negation term separately
-                for term, term_matches in negation_matches_dict.items():
-                    # Filter negation matches to the same file
-                    file_negations = term_matches[term_matches['filename'] == filename]
-                    
-                    # Look at each negation instance
-                    for neg_idx, neg_row in file_negations.iterrows():
-                        x2, y2 = neg_row['bbx0'], neg_row['bby0']
-                        distance = calculate_distance(x1, y1, x2, y2)
-                        
-                        # If this negation is close enough to exclude the match
-                        if distance <= negation_distance and distance < min_distance:
-                            has_nearby_negation = True
-                            excluding_term = term
-                            min_distance = distance
-                            # Don't break - we want to find the closest negation term
-                    
-                # After checking all terms, record which term excluded this match
-                if not has_nearby_negation:
-                    results_to_keep.append(idx)
-                elif excluding_term:
-                    excluded_by_term[excluding_term] += 1
+            # Record which term excluded each match
+            excluded_by_term = {term: 0 for term in negation_terms}
+            for term_index, term in enumerate(negation_locations):
+                excluded_by_term[term] = int(np.count_nonzero(excluded & (excluding_term == term_index)))
             
             # Keep only results without nearby negation terms
-            search_results = search_results.loc[results_to_keep]
+            search_results = search_results[~excluded]
             search_stats += f"\nAfter negation filtering: {len(search_results)} matches remain"
             
             # Print negation term statistics
@@ -229,70 +452,64 @@ def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text
     if len(search_results) == 0:
         return None, search_stats + "\nNo results remain after negation filtering"
     
-    # Apply date filtering
-    # Ensure we have date column for filtering
-    if 'date' not in search_results.columns:
-        # Try to extract date from filename
-        search_results['date'] = search_results['filename'].str.extract(r'(\d{4}-\d{2}-\d{2})')
+    # Apply date filtering on the dates parsed when the data was loaded
+    original_count = len(search_results)
     
-    # Convert date to datetime for proper filtering
-    if 'date' in search_results.columns:
-        try:
-            search_results['date'] = pd.to_datetime(search_results['date'])
-            
-            # Apply date filtering if specified
-            original_count = len(search_results)
-            
-            if start_date:
-                start_dt = pd.to_datetime(start_date)
-                search_results = search_results[search_results['date'] >= start_dt]
-                
-            if end_date:
-                end_dt = pd.to_datetime(end_date)
-                search_results = search_results[search_results['date'] <= end_dt]
-                
-            if (start_date or end_date) and len(search_results) < original_count:
-                search_stats += f"\nDate filtering removed {original_count - len(search_results)} results"
-                search_stats += f"\nRemaining after date filtering: {len(search_results)} results"
-                
-        except:
-            try:
-                search_results['date'] = pd.to_datetime(search_results['date'], format='%Y-%m-%d', errors='coerce')
-                
-                # Apply date filtering
-                original_count = len(search_results)
-                
-                if start_date:
-                    start_dt = pd.to_datetime(start_date)
-                    search_results = search_results[search_results['date'] >= start_dt]
-                    
-                if end_date:
-                    end_dt = pd.to_datetime(end_date)
-                    search_results = search_results[search_results['date'] <= end_dt]
-                    
-                if (start_date or end_date) and len(search_results) < original_count:
-                    search_stats += f"\nDate filtering removed {original_count - len(search_results)} results"
-                    search_stats += f"\nRemaining after date filtering: {len(search_results)} results"
-                    
-            except:
-                search_stats += "\nWarning: Could not convert date column to datetime for filtering"
+    if start_date:
+        search_results = search_results[search_results['date'] >= pd.to_datetime(start_date)]
+        
+    if end_date:
+        search_results = search_results[search_results['date'] <= pd.to_datetime(end_date)]
+        
+    if (start_date or end_date) and len(search_results) < original_count:
+        search_stats += f"\nDate filtering removed {original_count - len(search_results)} results"
+        search_stats += f"\nRemaining after date filtering: {len(search_results)} results"
     
     # If all results were filtered out by date
     if len(search_results) == 0:
         return None, search_stats + "\nNo results remain after date filtering"
     
     # Sort by page and co-occurrence count
-    search_results = search_results.sort_values(
-        by=['filename', 'page_number', 'co_occurring_terms_count', 'search_term'], 
-        ascending=[True, True, False, True]
-    )
-    
-    # Convert back to string format for dates 
-    if 'date' in search_results.columns and pd.api.types.is_datetime64_dtype(search_results['date']):
-        search_results['date'] = search_results['date'].dt.strftime('%Y-%m-%d')
+    search_results = search_results.iloc[co_occurrence_sort_order(search_results)]
     
     return search_results, search_stats
 
+cached_find_co_occurrences = memory.cache(find_co_occurrences) if memory is not None else find_co_occurrences
+
+def search_documents_co_occurrence(terms, min_terms_required, csv_file='big_text_with_position_may12.csv', 
+                                 negation_terms=None, negation_distance=100, 
+                                 start_date=None, end_date=None):
+    """
+    Searches for co-occurrence of multiple terms on the same page, reusing cached
+    results from earlier runs with the same arguments while the CSV is unchanged.
+    
+    Parameters:
+    terms (list): List of terms to search for
+    min_terms_required (int): Minimum number of terms required to be present on a page
+    csv_file (str): CSV file with text position data
+    negation_terms (list or str): Term(s) that negate matches if found nearby
+    negation_distance (float): Maximum distance to consider for negation
+    start_date (str): Start date in YYYY-MM-DD format to filter results
+    end_date (str): End date in YYYY-MM-DD format to filter results
+    
+    Returns:
+    DataFrame: Search results with position data for co-occurring terms
+    str: Message with search statistics
+    """
+    try:
+        csv_mtime = os.path.getmtime(csv_file)
+    except FileNotFoundError:
+        return None, f"Error: {csv_file} not found"
+    
+    result = cached_find_co_occurrences(terms, min_terms_required, csv_file, negation_terms,
+                                        negation_distance, start_date, end_date, csv_mtime=csv_mtime)
+    
+    if memory is not None:
+        # Keep the cache bounded, dropping the least recently used searches
+        memory.reduce_size(bytes_limit=CO_OCCURRENCE_CACHE_LIMIT)
+    
+    return result
+
 def save_co_occurrence_results(search_results, terms, min_terms_required, 
                              negation_terms=None, output_directory='.', date_range_str=""):
     """
@@ -420,18 +637,17 @@ def search_and_highlight_co_occurrence(terms, min_terms_required, base_folder,
     if pdf_path:
         print(f"{status} at: {pdf_path}")
         # Summary of findings by page
-        page_counts = search_results.groupby(['filename', 'page_number'])['search_term'].nunique()
-        print(f"\nFound content on {len(page_counts)} pages:")
+        page_groups = search_results.groupby(['filename', 'page_number'], observed=True)['search_term']
+        page_summary = page_groups.agg(unique_terms='nunique', total_matches='count')
+        print(f"\nFound content on {len(page_summary)} pages:")
         
         # Print top 10 pages with most term variety
-        top_pages = search_results.groupby(['filename', 'page_number'])['search_term'].agg(['nunique', 'count'])
-        top_pages.columns = ['unique_terms', 'total_matches']
-        top_pages = top_pages.sort_values('unique_terms', ascending=False).head(10)
+        top_pages = page_summary.sort_values('unique_terms', ascending=False).head(10)
+        terms_by_page = page_groups.unique().to_dict()
         
-        for i, ((filename, page), row) in enumerate(top_pages.iterrows(), 1):
-            page_terms = search_results[(search_results['filename'] == filename) & 
-                                       (search_results['page_number'] == page)]['search_term'].unique()
-            print(f"{i}. {filename} (Page {page}): {row['unique_terms']} terms, {row['total_matches']} matches")
+        for i, ((filename, page), unique_terms, total_matches) in enumerate(top_pages.itertuples(name=None), 1):
+            page_terms = terms_by_page[(filename, page)]
+            print(f"{i}. {filename} (Page {page}): {unique_terms} terms, {total_matches} matches")
             print(f"   Terms: {', '.join(page_terms)}")
         
         return pdf_path
@@ -1,20 +1,219 @@
 import ast
 import os
+import json
+import hashlib
+import functools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
 import matplotlib.pyplot as plt
 import re
 from pathlib import Path
 
-def extract_imports_from_file(file_path):
+# python-igraph is optional; when available its C force-directed layout is used
+try:
+    import igraph as ig
+except ImportError:
+    ig = None
+
+# Per-user directory holding one import cache file per analyzed folder
+# (%LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere), so
+# nothing is written into the folder being analyzed
+IMPORT_CACHE_DIRECTORY = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    or os.path.join(os.path.expanduser('~'), '.cache'),
+    'PDF_Search_highlight', 'import_cache'
+)
+
+# Minimum number of files to parse before using a process pool
+PARALLEL_MIN_FILES = 4
+
+def import_cache_path(folder_path):
+    """
+    Path of the import cache file of a folder, keyed by its absolute path.
     """
-    Extract all imports from a Python file using AST parsing.
+    folder_key = hashlib.sha1(os.path.abspath(folder_path).encode('utf-8')).hexdigest()
+    return os.path.join(IMPORT_CACHE_DIRECTORY, folder_key + '.json')
+
+def load_import_cache(folder_path):
+    """
+    Load the cached imports of the Python files in a folder.
+    
+    Parameters:
+    folder_path (str): Path to the analyzed folder
+    
+    Returns:
+    dict: Mapping of file path to its 'mtime_ns', 'size' and 'imports'
+    """
+    try:
+        with open(import_cache_path(folder_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_import_cache(folder_path, cache):
+    """
+    Save the cached imports of the Python files in a folder.
+    
+    Parameters:
+    folder_path (str): Path to the analyzed folder
+    cache (dict): Cache as returned by load_import_cache
+    """
+    try:
+        os.makedirs(IMPORT_CACHE_DIRECTORY, exist_ok=True)
+        with open(import_cache_path(folder_path), 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Warning: Could not save import cache: {e}")
+
+def extract_imports_from_file(file_path, cache=None):
+    """
+    Extract all imports from a Python file, reusing cached results while the
+    file's modification time and size are unchanged.
     
     Parameters:
     file_path (str): Path to the Python file
+    cache (dict): Optional cache from load_import_cache, updated in place
     
     Returns:
     dict: Dictionary with 'imports', 'from_imports', and 'local_imports'
     """
+    return extract_imports_from_files([file_path], cache)[0]
+
+def extract_imports_from_files(file_paths, cache=None):
+    """
+    Extract all imports from several Python files, parsing the files that are
+    not cached in worker processes when there are enough of them.
+    
+    Parameters:
+    file_paths (list): Paths to the Python files
+    cache (dict): Optional cache from load_import_cache, updated in place
+    
+    Returns:
+    list: Import dictionaries, in the order of file_paths
+    """
+    stats = [os.stat(file_path) for file_path in file_paths]
+    results = [None] * len(file_paths)
+    stale = []
+    
+    for i, (file_path, stat) in enumerate(zip(file_paths, stats)):
+        entry = cache.get(str(file_path)) if cache is not None else None
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            results[i] = entry['imports']
+        else:
+            stale.append(i)
+    
+    parse_args = (
+        [str(file_paths[i]) for i in stale],
+        [stats[i].st_mtime_ns for i in stale],
+        [stats[i].st_size for i in stale],
+    )
+    
+    # Starting worker processes only pays off for more than a few files
+    if len(stale) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as executor:
+            parsed_results = list(executor.map(parse_imports, *parse_args, chunksize=8))
+    else:
+        parsed_results = list(map(parse_imports, *parse_args))
+    
+    for i, (imports, parsed) in zip(stale, parsed_results):
+        results[i] = imports
+        if cache is not None and parsed:
+            cache[str(file_paths[i])] = {
+                'mtime_ns': stats[i].st_mtime_ns, 'size': stats[i].st_size, 'imports': imports
+            }
+    
+    return results
+
+# Node types that can contain statements; expressions never contain imports
+STATEMENT_NODE_TYPES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+def walk_statements(tree):
+    """
+    Yield the statements of a module breadth-first, in the same order as ast.walk,
+    without descending into expressions.
+    
+    Parameters:
+    tree (ast.Module): Parsed module
+    
+    Returns:
+    generator: Statement, exception handler and match case nodes
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        todo.extend(child for child in ast.iter_child_nodes(node)
+                    if isinstance(child, STATEMENT_NODE_TYPES))
+        yield node
+
+# Simple import statements: indentation, then 'from <module> import' or 'import <names>'
+# (bytes patterns, so files are scanned without decoding them first)
+IMPORT_RE = re.compile(rb'^([ \t]*)(?:from[ \t]+([\w.]+)[ \t]+import\b|import[ \t]+([^\n#;]*))', re.MULTILINE)
+IMPORT_WORD_RE = re.compile(rb'\bimport\b')
+TRIPLE_QUOTED_RE = re.compile(rb'("""|\'\'\')[\s\S]*?\1')
+
+def scan_imports(content):
+    """
+    Extract imports from source text with regular expressions, without parsing.
+    
+    This only succeeds when every occurrence of the word 'import' is a simple
+    module-level import statement outside triple-quoted strings; anything else
+    (nested or continued imports, 'import' in comments or strings) needs the AST.
+    
+    Parameters:
+    content (bytes): Python source code, undecoded
+    
+    Returns:
+    dict: Dictionary with 'imports', 'from_imports', and 'local_imports', or None
+          if the source has to be parsed
+    """
+    matches = list(IMPORT_RE.finditer(content))
+    if len(matches) != len(IMPORT_WORD_RE.findall(content)):
+        return None
+    
+    string_spans = [match.span() for match in TRIPLE_QUOTED_RE.finditer(content)]
+    imports = {'imports': [], 'from_imports': [], 'local_imports': []}
+    
+    for match in matches:
+        indent, from_module, import_names = match.groups()
+        if indent or any(start <= match.start() < end for start, end in string_spans):
+            return None
+        
+        if from_module is not None:
+            # Relative imports keep only the module name, like ImportFrom.module
+            module = from_module.decode('utf-8').lstrip('.')
+            if module:
+                imports['from_imports'].append(module)
+            continue
+        
+        import_names = import_names.decode('utf-8')
+        if '(' in import_names or import_names.rstrip().endswith('\\'):
+            return None
+        for name in import_names.split(','):
+            if not name.strip():
+                return None
+            imports['imports'].append(name.split()[0])
+    
+    return imports
+
+@functools.lru_cache(maxsize=None)
+def parse_imports(file_path, mtime_ns, size):
+    """
+    Extract all imports from a Python file, using AST parsing unless the
+    regex scan in scan_imports can handle it.
+    
+    The modification time and size are only part of the cache key, so an edited
+    file is parsed again.
+    
+    Parameters:
+    file_path (str): Path to the Python file
+    mtime_ns (int): Modification time of the file in nanoseconds
+    size (int): Size of the file in bytes
+    
+    Returns:
+    dict: Dictionary with 'imports', 'from_imports', and 'local_imports'
+    bool: Whether the file was parsed successfully
+    """
     imports = {
         'imports': [],           # import module
         'from_imports': [],      # from module import item
@@ -22,13 +221,19 @@ def extract_imports_from_file(file_path):
     }
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        # Read bytes; ast.parse handles the BOM and any coding declaration itself
+        with open(file_path, 'rb') as f:
             content = f.read()
         
+        # Simple files don't need the AST
+        scanned = scan_imports(content)
+        if scanned is not None:
+            return scanned, True
+        
         # Parse the AST
-        tree = ast.parse(content)
+        tree = ast.parse(content, filename=file_path)
         
-        for node in ast.walk(tree):
+        for node in walk_statements(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     imports['imports'].append(alias.name)
@@ -38,33 +243,50 @@ def extract_imports_from_file(file_path):
                     
     except Exception as e:
         print(f"Error parsing {file_path}: {e}")
+        return imports, False
     
-    return imports
+    return imports, True
 
-def find_local_imports(imports_dict, python_files_in_folder):
+def partition_imports(imports_dict, python_files_in_folder):
     """
-    Identify which imports are local Python files in the same folder.
+    Split the imports of a file into local and external ones in one pass.
     
     Parameters:
     imports_dict (dict): Dictionary of imports from extract_imports_from_file
     python_files_in_folder (set): Set of Python file names (without .py extension)
     
     Returns:
-    list: List of local imports
+    tuple: (all_imports, local_imports, external_imports), where local_imports
+    holds the unique local module names and external_imports the full names
+    of the other imports
     """
-    local_imports = []
-    
-    # Check all imports
     all_imports = imports_dict['imports'] + imports_dict['from_imports']
+    local_imports = {}
+    external_imports = []
     
     for imp in all_imports:
         # Remove any sub-module references (e.g., 'package.module' -> 'package')
-        base_module = imp.split('.')[0]
+        base_module = imp.split('.', 1)[0]
         
         if base_module in python_files_in_folder:
-            local_imports.append(base_module)
+            local_imports[base_module] = None  # Remove duplicates, keep order
+        else:
+            external_imports.append(imp)
     
-    return list(set(local_imports))  # Remove duplicates
+    return all_imports, list(local_imports), external_imports
+
+def find_local_imports(imports_dict, python_files_in_folder):
+    """
+    Identify which imports are local Python files in the same folder.
+    
+    Parameters:
+    imports_dict (dict): Dictionary of imports from extract_imports_from_file
+    python_files_in_folder (set): Set of Python file names (without .py extension)
+    
+    Returns:
+    list: List of local imports
+    """
+    return partition_imports(imports_dict, python_files_in_folder)[1]
 
 def analyze_python_dependencies(folder_path):
     """
@@ -76,10 +298,14 @@ def analyze_python_dependencies(folder_path):
     Returns:
     dict: Dictionary mapping each file to its dependencies
     """
-    folder_path = Path(folder_path)
-    
-    # Find all Python files in the folder
-    python_files = list(folder_path.glob("*.py"))
+    # Find all Python files in the folder; scandir entries know their type
+    # without an extra stat per file
+    try:
+        with os.scandir(folder_path) as entries:
+            python_files = [entry.path for entry in entries
+                            if entry.name.endswith('.py') and entry.is_file()]
+    except OSError:
+        python_files = []
     
     if not python_files:
         print(f"No Python files found in {folder_path}")
@@ -88,25 +314,25 @@ def analyze_python_dependencies(folder_path):
     print(f"Found {len(python_files)} Python files")
     
     # Create a set of Python file names (without extension) for quick lookup
-    python_file_names = {f.stem for f in python_files}
+    python_file_names = {os.path.splitext(os.path.basename(f))[0] for f in python_files}
     
     dependencies = {}
+    import_cache = load_import_cache(folder_path)
+    
+    # Extract imports, parsing uncached files in parallel
+    all_imports = extract_imports_from_files(python_files, import_cache)
     
-    for py_file in python_files:
-        file_name = py_file.stem
+    for py_file, imports in zip(python_files, all_imports):
+        file_name = os.path.splitext(os.path.basename(py_file))[0]
         print(f"Analyzing {file_name}.py...")
         
-        # Extract imports
-        imports = extract_imports_from_file(py_file)
-        
-        # Find local dependencies
-        local_deps = find_local_imports(imports, python_file_names)
+        # Split the imports into local and external dependencies
+        file_imports, local_deps, external_deps = partition_imports(imports, python_file_names)
         
         dependencies[file_name] = {
             'local_dependencies': local_deps,
-            'all_imports': imports['imports'] + imports['from_imports'],
-            'external_dependencies': [imp for imp in imports['imports'] + imports['from_imports'] 
-                                    if imp.split('.')[0] not in python_file_names]
+            'all_imports': file_imports,
+            'external_dependencies': external_deps
         }
         
         if local_deps:
@@ -114,8 +340,43 @@ def analyze_python_dependencies(folder_path):
         else:
             print(f"  -> No local dependencies")
     
+    save_import_cache(folder_path, import_cache)
+    
     return dependencies
 
+def dependency_layout(G):
+    """
+    Compute node positions for drawing a dependency graph.
+    
+    Small graphs are laid out on a circle. Larger ones use a force-directed
+    (Fruchterman-Reingold) layout computed by igraph when it is installed.
+    Otherwise connected graphs get a spectral layout (one sparse eigen-solve)
+    and disconnected ones, which spectral layout collapses onto a few
+    points, fall back to networkx's spring layout.
+    
+    Parameters:
+    G (DiGraph): The dependency graph
+    
+    Returns:
+    dict: Mapping of node to (x, y) position
+    """
+    if len(G.nodes()) <= 10:
+        return nx.circular_layout(G)
+    
+    if ig is not None:
+        nodes = list(G.nodes())
+        node_indices = {node: i for i, node in enumerate(nodes)}
+        graph = ig.Graph(n=len(nodes), directed=True,
+                         edges=[(node_indices[u], node_indices[v]) for u, v in G.edges()])
+        coords = graph.layout_fruchterman_reingold(niter=50)
+        return {node: tuple(coord) for node, coord in zip(nodes, coords)}
+    
+    undirected = G.to_undirected(as_view=True)
+    if nx.is_connected(undirected):
+        return nx.spectral_layout(undirected)
+    
+    return nx.spring_layout(G, k=2, iterations=50)
+
 def create_dependency_graph(dependencies, save_path=None):
     """
     Create and display a network graph of dependencies.
@@ -141,10 +402,7 @@ def create_dependency_graph(dependencies, save_path=None):
     plt.figure(figsize=(12, 8))
     
     # Use a layout algorithm
-    if len(G.nodes()) > 10:
-        pos = nx.spring_layout(G, k=2, iterations=50)
-    else:
-        pos = nx.circular_layout(G)
+    pos = dependency_layout(G)
     
     # Draw the graph
     nx.draw_networkx_nodes(G, pos, node_color='lightblue', 
@@ -178,28 +436,30 @@ def generate_dependency_report(dependencies, output_file=None):
     dependencies (dict): Dependencies dictionary from analyze_python_dependencies
     output_file (str): Optional file path to save the report
     """
-    report = "Python File Dependency Report\n"
-    report += "=" * 40 + "\n\n"
+    # Collect the pieces and join them once at the end
+    parts = ["Python File Dependency Report\n", "=" * 40 + "\n\n"]
     
     for file_name, deps in dependencies.items():
-        report += f"File: {file_name}.py\n"
-        report += "-" * (len(file_name) + 10) + "\n"
+        parts.append(f"File: {file_name}.py\n")
+        parts.append("-" * (len(file_name) + 10) + "\n")
         
         if deps['local_dependencies']:
-            report += f"Local Dependencies: {', '.join(deps['local_dependencies'])}\n"
+            parts.append(f"Local Dependencies: {', '.join(deps['local_dependencies'])}\n")
         else:
-            report += "Local Dependencies: None\n"
+            parts.append("Local Dependencies: None\n")
         
         if deps['external_dependencies']:
             ext_deps = deps['external_dependencies'][:10]  # Limit to first 10
-            report += f"External Dependencies: {', '.join(ext_deps)}"
+            parts.append(f"External Dependencies: {', '.join(ext_deps)}")
             if len(deps['external_dependencies']) > 10:
-                report += f" (and {len(deps['external_dependencies']) - 10} more)"
-            report += "\n"
+                parts.append(f" (and {len(deps['external_dependencies']) - 10} more)")
+            parts.append("\n")
         else:
-            report += "External Dependencies: None\n"
+            parts.append("External Dependencies: None\n")
         
-        report += "\n"
+        parts.append("\n")
+    
+    report = "".join(parts)
     
     print(report)
     
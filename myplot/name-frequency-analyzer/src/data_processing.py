@@ -1,7 +1,53 @@
+import numpy as np
 import pandas as pd
+
+# PyArrow is optional; when available its multi-threaded CSV reader is used
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+def add_year_column(df):
+    # Parse dates once and keep the year as a plain integer column for filtering
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['year'] = df['date'].dt.year
+    return df
+
+def year_mask(df, start_year=None, end_year=None):
+    # Compare the integer 'year' column as a plain NumPy array; missing years never match
+    year = df['year'].to_numpy(dtype=float, na_value=np.nan)
+    mask = np.ones(len(year), dtype=bool)
+    if start_year is not None:
+        mask &= year >= start_year
+    if end_year is not None:
+        mask &= year <= end_year
+    return mask
+
+def add_text_lower_column(df):
+    # Lowercase the text once so case-insensitive name searches don't redo it per call
+    df['text_lower'] = df['text'].str.lower()
+    return df
+
 def load_data(file_path):
     try:
-        df = pd.read_csv(file_path)
+        df = None
+        if pa is not None:
+            try:
+                # Parse dates while reading so later pd.to_datetime calls are no-ops
+                convert_options = pacsv.ConvertOptions(column_types={'date': pa.timestamp('ns')})
+                df = pacsv.read_csv(file_path, convert_options=convert_options).to_pandas()
+            except pa.ArrowInvalid:
+                # Values PyArrow cannot convert (e.g. unusual dates); let pandas handle them
+                pass
+        
+        if df is None:
+            df = pd.read_csv(file_path)
+        if 'date' in df.columns:
+            df = add_year_column(df)
+        if 'text' in df.columns:
+            df = add_text_lower_column(df)
         return df
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found.")
@@ -12,8 +58,9 @@ def filter_data_by_year(df, start_year, end_year):
         print("Error: The DataFrame does not contain a 'date' column.")
         return None
     
-    df['date'] = pd.to_datetime(df['date'])
-    filtered_df = df[(df['date'].dt.year >= start_year) & (df['date'].dt.year <= end_year)]
+    if 'year' not in df.columns:
+        df = add_year_column(df.copy())
+    filtered_df = df[year_mask(df, start_year, end_year)]
     return filtered_df
 
 def calculate_yearly_average(df, name_column, value_column):
@@ -21,7 +68,9 @@ def calculate_yearly_average(df, name_column, value_column):
         print("Error: The DataFrame does not contain the specified columns.")
         return None
     
-    df_grouped = df.groupby(df['date'].dt.year).agg({value_column: 'mean'}).reset_index()
+    # Reuse the year column from load_data instead of extracting it again
+    years = df['year'] if 'year' in df.columns else df['date'].dt.year
+    df_grouped = df.groupby(years.rename('date')).agg({value_column: 'mean'}).reset_index()
     df_grouped.rename(columns={'date': 'year'}, inplace=True)
     return df_grouped
 
@@ -1,6 +1,78 @@
+import re
+from functools import lru_cache
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.data_processing import add_year_column, year_mask
+
+# pyahocorasick is optional; when available all names are found in one pass per text
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+@lru_cache(maxsize=32)
+def names_pattern(names):
+    """
+    Compile (once per set of names) a regex matching any of the lowercased names.
+
+    Parameters:
+    names (tuple): The names to match.
+
+    Returns:
+    Pattern: The compiled alternation.
+    """
+    return re.compile('|'.join(re.escape(name.lower()) for name in names))
+
+def find_names(texts, names, lowered=False):
+    """
+    Find which of the names occur in each text (case-insensitive substring match).
+
+    With pyahocorasick installed, one automaton over all names scans each text
+    once. Otherwise a single regex alternation of all names selects the texts
+    containing any of them, and only those are checked for each name.
+
+    Parameters:
+    texts (Series): The text values to search.
+    names (list): A list of names to search for.
+    lowered (bool): Whether texts are already lowercase (e.g. the 'text_lower' column).
+
+    Returns:
+    Series: For each text, the list of names found in it, in the order of names.
+    """
+    if not names:
+        return pd.Series([[] for _ in range(len(texts))], index=texts.index, dtype=object)
+
+    # Lowercase the whole column in one vectorized call unless it already is
+    if not lowered:
+        texts = texts.str.lower()
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        name_indices = {}
+        for index, name in enumerate(names):
+            name_indices.setdefault(name.lower(), []).append(index)
+        for word, indices in name_indices.items():
+            automaton.add_word(word, indices)
+        automaton.make_automaton()
+
+        found = [
+            sorted({index for _, indices in automaton.iter(text) for index in indices})
+            if isinstance(text, str) else []
+            for text in texts
+        ]
+    else:
+        any_name = texts.str.contains(names_pattern(tuple(names)), na=False).to_numpy(dtype=bool)
+        candidates = texts[any_name]
+
+        masks = np.zeros((len(texts), len(names)), dtype=bool)
+        for index, name in enumerate(names):
+            masks[any_name, index] = candidates.str.contains(name.lower(), regex=False, na=False)
+        found = [np.flatnonzero(row) for row in masks]
+
+    return pd.Series([[names[index] for index in indices] for indices in found],
+                     index=texts.index, dtype=object)
 
 def plot_yearly_average(df, names, start_year=None, end_year=None):
     """
@@ -15,33 +87,30 @@ def plot_yearly_average(df, names, start_year=None, end_year=None):
     # Create a copy to avoid SettingWithCopyWarning
     df = df.copy()
     
-    if not pd.api.types.is_datetime64_any_dtype(df['date']):
-        df['date'] = pd.to_datetime(df['date'])
+    # Create a 'year' column unless load_data already did
+    if 'year' not in df.columns:
+        df = add_year_column(df)
 
     # Filter by year range if specified
-    if start_year is not None:
-        df = df[df['date'].dt.year >= start_year]
-    if end_year is not None:
-        df = df[df['date'].dt.year <= end_year]
-
-    # Create a 'year' column
-    df['year'] = df['date'].dt.year
+    if start_year is not None or end_year is not None:
+        df = df[year_mask(df, start_year, end_year)]
     
-    # Create a new column to indicate which name is found in each text
-    df['found_name'] = None
-    for name in names:
-        mask = df['text'].str.contains(name, case=False, na=False)
-        df.loc[mask, 'found_name'] = name
+    # Create a new column with the names found in each text, one row per name
+    if 'text_lower' in df.columns:
+        df['found_name'] = find_names(df['text_lower'], names, lowered=True)
+    else:
+        df['found_name'] = find_names(df['text'], names)
     
-    # Filter rows where at least one name was found
-    df_with_names = df[df['found_name'].notna()]
+    # Keep rows where at least one name was found
+    df_with_names = df.explode('found_name').dropna(subset=['found_name'])
+    df_with_names['found_name'] = pd.Categorical(df_with_names['found_name'], categories=list(dict.fromkeys(names)))
     
     if df_with_names.empty:
         print(f"No occurrences of the specified names found in the text column.")
         return
         
     # Calculate yearly occurrences for each name
-    yearly_counts = df_with_names.groupby(['year', 'found_name']).size().reset_index(name='count')
+    yearly_counts = df_with_names.groupby(['year', 'found_name'], observed=True).size().reset_index(name='count')
     
     # Calculate the proportion of each name per year - fixing the structure
     total_counts = yearly_counts.groupby('year')['count'].sum().reset_index()
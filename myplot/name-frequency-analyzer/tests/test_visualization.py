@@ -1,6 +1,6 @@
 import pytest
 import pandas as pd
-from src.visualization import plot_yearly_average
+from src.visualization import plot_yearly_average, find_names
 
 def test_plot_yearly_average():
     data = {
@@ -22,4 +22,12 @@ def test_plot_yearly_average():
 
     # Check if the x-axis and y-axis labels are set
     assert fig.axes[0].get_xlabel() == 'Year'
-    assert fig.axes[0].get_ylabel() == 'Average Count'
\ No newline at end of file
+    assert fig.axes[0].get_ylabel() == 'Average Count'
+
+def test_find_names():
+    texts = pd.Series(['Alice met bob', 'nobody', None, 'ALICE'])
+    
+    found = find_names(texts, ['Bob', 'Alice'])
+    
+    assert found.tolist() == [['Bob', 'Alice'], [], [], ['Alice']]
+    assert find_names(texts.str.lower(), ['Bob', 'Alice'], lowered=True).tolist() == found.tolist()
@@ -1,10 +1,46 @@
 import pymupdf  # PyMuPDF
 import os
 import sys
-import glob
-from pypdf import PdfWriter
+import zlib
+import numpy as np
 import pandas as pd
-import fitz  # PyMuPDF
+
+# Highlight colors, indexed by highlight_color_indices
+HIGHLIGHT_COLORS = [
+    (1, 1, 0),      # Yellow
+    (1, 0.8, 0.3),  # Orange
+    (0.6, 1, 0.6),  # Green
+    (0.6, 0.8, 1),  # Blue
+    (1, 0.6, 0.6)   # Pink
+]
+
+def highlight_color_indices(search_results):
+    """
+    Picks a highlight color for every search result at once
+    
+    Regular searches are colored by similarity: exact matches yellow, 90 and up
+    orange, 80 and up green, anything else blue. Co-occurrence searches get a
+    color per search term. Otherwise everything is yellow.
+    
+    Parameters:
+    search_results: DataFrame of search results
+    
+    Returns:
+    Array of indices into HIGHLIGHT_COLORS, one per row
+    """
+    if 'similarity' in search_results.columns:
+        similarity = search_results['similarity'].to_numpy(dtype=float)
+        return np.select([similarity == 100, similarity >= 90, similarity >= 80], [0, 1, 2], default=3)
+    
+    if 'co_occurring_terms' in search_results.columns and 'search_term' in search_results.columns:
+        # Get a color based on the term (consistent per term, and across runs)
+        term_colors = {
+            term: zlib.crc32(str(term).encode('utf-8')) % len(HIGHLIGHT_COLORS)
+            for term in search_results['search_term'].unique()
+        }
+        return search_results['search_term'].map(term_colors).to_numpy(dtype=int)
+    
+    return np.zeros(len(search_results), dtype=int)
 
 def highlight_search_results(csv_path, base_folder, output_directory, add_watermarks=False, add_bookmarks=False, custom_pdf_name=None):
     """
@@ -44,30 +80,29 @@ def highlight_search_results(csv_path, base_folder, output_directory, add_waterm
         else:
             output_pdf_path = os.path.join(output_directory, f"{search_term_filename}.pdf")
     
-    # Read search results
-    search_results = pd.read_csv(csv_path)
+    # Read search results; filenames repeat, so group them by category codes
+    search_results = pd.read_csv(csv_path, dtype={'filename': 'category'})
     
     if len(search_results) == 0:
         return None, "No search results found in CSV", 0, 0
     
-    # Check if this is a co-occurrence search by looking for specific columns
-    is_co_occurrence = 'co_occurring_terms' in search_results.columns
-    has_similarity = 'similarity' in search_results.columns
-    
-    # Create a PDF writer for the output file
-    pdf_writer = PdfWriter()
+    # Pull the boxes and highlight colors out of the DataFrame once
+    bboxes = search_results[['bbx0', 'bby0', 'bbx1', 'bby1']].to_numpy(dtype=float)
+    color_indices = highlight_color_indices(search_results)
     
-    # Keep track of temporary files
-    temp_files = []
+    # Build the output PDF in memory
+    output_doc = pymupdf.open()
+    bookmarks = []
     processed_count = 0
     highlighted_count = 0
     
     try:
-        # Get unique filenames while preserving sort order
-        unique_filenames = search_results['filename'].drop_duplicates().tolist()
+        # Group the rows of each file in one pass, keeping files in the order
+        # they first appear
+        file_rows_by_name = search_results.groupby('filename', sort=False, observed=True).indices
         
         # Process each file in the sorted order
-        for filename in unique_filenames:
+        for filename, file_rows in file_rows_by_name.items():
             pdf_path = os.path.join(base_folder, filename)
             
             # Check if the file exists
@@ -75,107 +110,49 @@ def highlight_search_results(csv_path, base_folder, output_directory, add_waterm
                 print(f"Warning: File not found: {pdf_path}")
                 continue
             
-            # Get all highlights for this file
-            file_results = search_results[search_results['filename'] == filename]
+            # Name shown in the watermark and bookmark: no path, no .pdf extension
+            display_name = os.path.basename(filename)
+            if display_name.lower().endswith('.pdf'):
+                display_name = display_name[:-4]
             
             try:
-                # Open the PDF
-                doc = pymupdf.open(pdf_path)
-                page = doc[0]  # Single-page PDFs
-                
-                # Apply all highlights for this page
-                hits_count = 0
-                for _, row in file_results.iterrows():
-                    # Create a rectangle from the bounding box coordinates
-                    rect = pymupdf.Rect(row['bbx0'], row['bby0'], row['bbx1'], row['bby1'])
+                # Open the PDF; it is closed whether or not highlighting succeeds
+                with pymupdf.open(pdf_path) as doc:
+                    page = doc[0]  # Single-page PDFs
                     
-                    # Determine highlight color
-                    if has_similarity:
-                        # Use similarity-based coloring for regular searches
-                        similarity = row['similarity']
-                        if similarity == 100:  # Exact match - bright yellow
-                            highlight_color = (1, 1, 0)  # Yellow
-                        elif similarity >= 90:  # Very similar - light orange
-                            highlight_color = (1, 0.8, 0.3)
-                        elif similarity >= 80:  # Similar - light green
-                            highlight_color = (0.6, 1, 0.6)
-                        else:  # Less similar - light blue
-                            highlight_color = (0.6, 0.8, 1)
-                    elif is_co_occurrence:
-                        # For co-occurrence searches, use term-based coloring if available
-                        if 'search_term' in row:
-                            # Get a color based on the term (consistent per term)
-                            term = row['search_term']
-                            term_hash = hash(term) % 5
-                            term_colors = [
-                                (1, 1, 0),     # Yellow
-                                (1, 0.8, 0.3),  # Orange
-                                (0.6, 1, 0.6),  # Green
-                                (0.6, 0.8, 1),  # Blue
-                                (1, 0.6, 0.6)   # Pink
-                            ]
-                            highlight_color = term_colors[term_hash]
-                        else:
-                            # Default highlight color if no term information
-                            highlight_color = (1, 1, 0)  # Yellow
-                    else:
-                        # Default highlight color when no special information
-                        highlight_color = (1, 1, 0)  # Yellow
+                    # Apply all highlights for this page
+                    hits_count = 0
+                    for bbox, color_index in zip(bboxes[file_rows], color_indices[file_rows]):
+                        # Create a rectangle from the bounding box coordinates
+                        rect = pymupdf.Rect(*bbox)
+                        highlight_color = HIGHLIGHT_COLORS[color_index]
+                        
+                        # Apply the highlight
+                        highlight = page.add_highlight_annot(rect)
+                        highlight.set_colors(stroke=highlight_color)
+                        highlight.update()
+                        
+                        hits_count += 1
                     
-                    # Apply the highlight
-                    highlight = page.add_highlight_annot(rect)
-                    highlight.set_colors(stroke=highlight_color)
-                    highlight.update()
+                    # Add watermark if required
+                    if add_watermarks:
+                        # Add the filename as a watermark
+                        page = add_filename_watermark(
+                            page, 
+                            display_name,  # Pass the current filename
+                            opacity=0.2,  # 20% opacity (80% transparent)
+                            color=(0, 0, 0.7),  # Dark blue color
+                            font_size=36  # Larger text size
+                        )
                     
-                    hits_count += 1
-                
-                # Add watermark if required
-                if add_watermarks:
-                    # Add the filename as a watermark
-                    page = add_filename_watermark(
-                        page, 
-                        pdf_path,  # Pass the current filename
-                        opacity=0.2,  # 20% opacity (80% transparent)
-                        color=(0, 0, 0.7),  # Dark blue color
-                        font_size=36  # Larger text size
-                    )
-                
-                # Create a temporary highlighted PDF
-                temp_path = f"_tmp_{filename.replace(' ', '_').replace(',', '').replace('.pdf', '')}.pdf"
-                doc.save(temp_path, incremental=False)
-                doc.close()
-                
-                # Track temp files
-                temp_files.append(temp_path)
-                
-                # Add the temporary PDF to our output PDF
-                pdf_writer.append(temp_path)
+                    # Append the highlighted pages to the output PDF
+                    first_page_number = output_doc.page_count + 1  # 1-based, for the outline
+                    output_doc.insert_pdf(doc)
                 
                 # Add bookmark for the current file if required
                 if add_bookmarks:
-                    # Create a bookmark for the first page of this file
-                    first_page_number = pdf_writer.get_num_pages() - 1  # Current last page
-                    bookmark_title = os.path.basename(filename)
-                    if bookmark_title.lower().endswith('.pdf'):
-                        bookmark_title = bookmark_title[:-4]
-                        
-                    try:
-                        # Try the standard method first
-                        pdf_writer.add_outline_item(
-                            title=bookmark_title,
-                            page_number=first_page_number,
-                            parent=None  # Top-level bookmark
-                        )
-                    except AttributeError:
-                        # Fallback for older PyPDF versions
-                        try:
-                            # For older versions of PyPDF
-                            pdf_writer.addBookmark(
-                                title=bookmark_title,
-                                pagenum=first_page_number
-                            )
-                        except Exception as e:
-                            print(f"Warning: Could not add bookmark for {bookmark_title}: {e}")
+                    # Top-level bookmark for the first page of this file
+                    bookmarks.append([1, display_name, first_page_number])
                 
                 processed_count += 1
                 highlighted_count += hits_count
@@ -185,7 +162,9 @@ def highlight_search_results(csv_path, base_folder, output_directory, add_waterm
         
         # Save the final PDF if we have any pages
         if processed_count > 0:
-            pdf_writer.write(output_pdf_path)
+            if bookmarks:
+                output_doc.set_toc(bookmarks)
+            output_doc.save(output_pdf_path, deflate=True, garbage=4)
             status_message = f"Created PDF with {processed_count} pages and {highlighted_count} highlighted terms"
             
             return output_pdf_path, status_message, processed_count, highlighted_count
@@ -193,28 +172,15 @@ def highlight_search_results(csv_path, base_folder, output_directory, add_waterm
             return None, "No pages were successfully processed. No output PDF created.", 0, 0
             
     finally:
-        # Clean up temporary files
-        for temp_path in temp_files:
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except Exception as e:
-                    print(f"Failed to remove {temp_path}: {e}")
-        
-        # Catch any missed temporary files
-        for temp_file in glob.glob("_tmp_*.pdf"):
-            try:
-                os.remove(temp_file)
-            except Exception:
-                pass
+        output_doc.close()
 
-def add_filename_watermark(page, filename, opacity=0.15, color=(0, 0, 0.7), font_size=36):
+def add_filename_watermark(page, display_name, opacity=0.15, color=(0, 0, 0.7), font_size=36):
     """
     Adds a semi-transparent filename watermark to a PDF page
     
     Parameters:
     page: PyMuPDF page object
-    filename: String containing the filename to display
+    display_name: Filename to display, already without path or .pdf extension
     opacity: Float between 0-1 for transparency level (default reduced to 0.15)
     color: RGB tuple (0-1 scale) for text color
     font_size: Size of the font for the watermark
@@ -222,11 +188,6 @@ def add_filename_watermark(page, filename, opacity=0.15, color=(0, 0, 0.7), font
     # Get page dimensions
     rect = page.rect
     
-    # Extract just the filename without path and possibly trim extension
-    display_name = os.path.basename(filename)
-    if display_name.lower().endswith('.pdf'):
-        display_name = display_name[:-4]  # Remove .pdf extension
-    
     # Move watermark more to the left side of center
     center_x = rect.width * 0.4  # Moved left from 0.5 to 0.4
     center_y = rect.height * 0.5
@@ -234,7 +195,7 @@ def add_filename_watermark(page, filename, opacity=0.15, color=(0, 0, 0.7), font
     try:
         # Create a watermark as an annotation - this makes it non-selectable
         # and provides better transparency control
-        watermark_rect = fitz.Rect(
+        watermark_rect = pymupdf.Rect(
             center_x - rect.width * 0.4,  # Expanded left boundary
             center_y - font_size,
             center_x + rect.width * 0.4,  # Expanded right boundary
@@ -263,7 +224,7 @@ def add_filename_watermark(page, filename, opacity=0.15, color=(0, 0, 0.7), font
         try:
             # Fallback 1: Use standard text insertion with reduced opacity
             page.insert_text(
-                fitz.Point(center_x, center_y),
+                pymupdf.Point(center_x, center_y),
                 display_name,
                 fontsize=font_size,
                 fontname="helv-bold",
@@ -276,7 +237,7 @@ def add_filename_watermark(page, filename, opacity=0.15, color=(0, 0, 0.7), font
             try:
                 # Fallback 2: Simplest possible approach
                 page.insert_text(
-                    fitz.Point(center_x, center_y),
+                    pymupdf.Point(center_x, center_y),
                     display_name,
                     fontsize=font_size
                 )
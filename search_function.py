@@ -1,26 +1,47 @@
 import os
 import pandas as pd
 import re
-import math
+import functools
+import numpy as np
 from rapidfuzz import fuzz, process
+from text_positions import read_text_positions, parse_dates, positions_by_file, nearest_negation_distances
+
+# PyArrow is optional; when available whole text columns are cleaned and split in Arrow
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pc = None
+
+# Runs of characters that clean_text turns into a space (the string form is
+# also used by the column-wide pandas/Arrow cleaning)
+NON_ALPHA_PATTERN = r'[^a-zA-Z\s]+'
+NON_ALPHA_RE = re.compile(NON_ALPHA_PATTERN)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Characters that give a search term a regex meaning; terms without any of them
+# are matched as plain text against the lowercased corpus
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
 
 def clean_text(text):
     """Replace non-alphabetic characters with spaces and normalize whitespace"""
     if not isinstance(text, str):
         return ""
     # Replace non-alphabetic characters with spaces
-    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    text = NON_ALPHA_RE.sub(' ', text)
     # Normalize whitespace (replace multiple spaces with single space)
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     return text.strip()
 
-def word_level_similarity(search_term, text):
+def word_level_similarity(search_term, text, similarity_threshold=0):
     """
     Compare search term against each word in text and return highest similarity.
     
     Args:
         search_term (str): Single word to search for
         text (str): Text that may contain multiple words
+        similarity_threshold (int): Scores that cannot round up to this are
+            not computed in full and are reported as 0
         
     Returns:
         int: Highest similarity score (0-100)
@@ -42,13 +63,214 @@ def word_level_similarity(search_term, text):
     if not words:  # Empty text
         return 0
         
-    # Calculate similarity for each word and return the maximum
-    scores = [round(fuzz.ratio(clean_search, word)) for word in words]
-    return max(scores) if scores else 0
+    # Find the best matching word, letting rapidfuzz skip hopeless words early
+    best = process.extractOne(clean_search, words, scorer=fuzz.ratio,
+                              score_cutoff=score_cutoff(similarity_threshold))
+    return round(best[1]) if best else 0
+
+def text_words(texts):
+    """
+    Clean and split a whole column of texts into lowercase words, like clean_text.
+    
+    With PyArrow installed the cleaning, splitting and deduplication all run
+    in Arrow compute kernels; otherwise pandas string methods are used.
+    
+    Args:
+        texts (Series): Texts that may contain multiple words
+        
+    Returns:
+        list: The distinct words
+        ndarray: For every word occurrence, its index into the distinct words
+        ndarray: For every word occurrence, the position of its text (ascending)
+    """
+    if pc is not None:
+        try:
+            text_array = pa.array(texts, type=pa.string(), from_pandas=True)
+        except (pa.ArrowException, TypeError):
+            # Non-string values; pandas skips those below
+            text_array = None
+        
+        if text_array is not None:
+            if isinstance(text_array, pa.ChunkedArray):
+                text_array = text_array.combine_chunks()
+            cleaned = pc.ascii_lower(pc.replace_substring_regex(text_array, NON_ALPHA_PATTERN, ' '))
+            word_lists = pc.utf8_split_whitespace(cleaned)
+            words = pc.list_flatten(word_lists)
+            word_rows = pc.list_parent_indices(word_lists)
+            
+            # Leading and trailing whitespace leave empty strings behind
+            non_empty = pc.greater(pc.binary_length(words), 0)
+            encoded = pc.dictionary_encode(words.filter(non_empty))
+            return (encoded.dictionary.to_pylist(),
+                    encoded.indices.to_numpy(zero_copy_only=False),
+                    word_rows.filter(non_empty).to_numpy(zero_copy_only=False))
+    
+    word_lists = (texts.str.replace(NON_ALPHA_PATTERN, ' ', regex=True)
+                       .str.lower()
+                       .str.split())
+    word_counts = word_lists.str.len().fillna(0).to_numpy(dtype=np.int64)
+    words = [word for word_list in word_lists[word_counts > 0] for word in word_list]
+    word_codes, unique_words = pd.factorize(pd.Series(words, dtype=object))
+    word_rows = np.repeat(np.arange(len(texts)), word_counts)
+    return list(unique_words), word_codes, word_rows
 
-def calculate_distance(x1, y1, x2, y2):
-    """Calculate Euclidean distance between two points"""
-    return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+def score_cutoff(similarity_threshold):
+    """
+    Lowest raw fuzz.ratio score that can still round to similarity_threshold.
+    
+    Args:
+        similarity_threshold (int): Minimum rounded similarity score
+        
+    Returns:
+        float: Cutoff to pass to rapidfuzz as score_cutoff
+    """
+    return max(similarity_threshold - 0.5, 0)
+
+def word_level_similarities(search_term, texts, words=None, similarity_threshold=0):
+    """
+    Vectorized word_level_similarity over a column of texts.
+    
+    All texts are cleaned and split at once, each distinct word is scored
+    against the search term in one batched rapidfuzz call, and the best
+    score of each text's words is taken.
+    
+    Args:
+        search_term (str): Single word to search for
+        texts (Series): Texts that may contain multiple words
+        words (tuple): Optional result of text_words(texts), to reuse across searches
+        similarity_threshold (int): Scores that cannot round up to this are
+            not computed in full and are reported as 0
+        
+    Returns:
+        ndarray: Highest similarity score (0-100) for each text
+    """
+    similarities = np.zeros(len(texts), dtype=np.int64)
+    if not isinstance(search_term, str) or len(texts) == 0:
+        return similarities
+    
+    clean_search = clean_text(search_term).lower()
+    unique_words, word_codes, word_rows = words if words is not None else text_words(texts)
+    if not unique_words:
+        return similarities
+    
+    # Score each distinct word once; an exact word match scores 100 anyway
+    unique_scores = process.cdist([clean_search], unique_words, scorer=fuzz.ratio, dtype=np.float64,
+                                  score_cutoff=score_cutoff(similarity_threshold), workers=-1)[0]
+    word_scores = np.round(unique_scores).astype(np.int64)[word_codes]
+    
+    # Highest score of each text's words; a text's words are contiguous
+    starts = np.flatnonzero(np.diff(word_rows, prepend=-1))
+    similarities[word_rows[starts]] = np.maximum.reduceat(word_scores, starts)
+    return similarities
+
+@functools.lru_cache(maxsize=1)
+def read_search_corpus(csv_file, csv_mtime):
+    """
+    Read text position data and index the words of its text column.
+    
+    The CSV modification time is part of the cache key, so repeated searches
+    of an unchanged CSV reuse the data, its word index, its positions, its
+    duplicate rows and its lowercased text.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    csv_mtime (float): Modification time of csv_file
+    
+    Returns:
+    DataFrame: Text position data
+    tuple: Word index of the text column, as returned by text_words
+    ndarray: Contiguous (n, 2) array of each row's (bbx0, bby0)
+    ndarray: Boolean mask of rows that repeat an earlier row exactly
+    Series: The text column in lowercase
+    """
+    df = read_text_positions(csv_file, csv_mtime)
+    positions = np.ascontiguousarray(df[['bbx0', 'bby0']].to_numpy(dtype=float))
+    return df, text_words(df['text']), positions, df.duplicated().to_numpy(), df['text'].str.lower()
+
+def load_search_corpus(csv_file):
+    """
+    Load text position data and its word index, reusing the cached copy while
+    the CSV is unchanged.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    
+    Returns:
+    DataFrame: Text position data (shared between calls, so not modified in place)
+    tuple: Word index of the text column, as returned by text_words
+    ndarray: Contiguous (n, 2) array of each row's (bbx0, bby0)
+    ndarray: Boolean mask of rows that repeat an earlier row exactly
+    Series: The text column in lowercase
+    """
+    return read_search_corpus(csv_file, os.path.getmtime(csv_file))
+
+def locate_negation_terms(df, negation_terms):
+    """
+    Find the whole-word occurrences of each negation term, grouped by file.
+    
+    Parameters:
+    df (DataFrame): Text position data
+    negation_terms (tuple): Terms to look for
+    
+    Returns:
+    dict: Number of rows containing each term
+    dict: For each term, its occurrences by file, as returned by positions_by_file
+    """
+    # Scan the whole column once for any of the terms, so each term below is
+    # only looked up in the rows containing one of them
+    any_term_pattern = r'\b(?:' + '|'.join(re.escape(term) for term in negation_terms) + r')\b'
+    negation_rows = np.flatnonzero(
+        df['text'].str.contains(any_term_pattern, case=False, na=False, regex=True).to_numpy(dtype=bool))
+    negation_text = df['text'].iloc[negation_rows]
+    
+    counts = {}
+    locations = {}
+    for term in negation_terms:
+        # Use word boundaries to match whole words only
+        pattern = r'\b' + re.escape(term) + r'\b'
+        term_rows = negation_rows[negation_text.str.contains(pattern, case=False, na=False, regex=True).to_numpy(dtype=bool)]
+        counts[term] = len(term_rows)
+        locations[term] = positions_by_file(df.iloc[term_rows])
+    
+    return counts, locations
+
+@functools.lru_cache(maxsize=8)
+def read_negation_index(csv_file, csv_mtime, negation_terms):
+    """
+    Locate negation terms in the search corpus of a CSV.
+    
+    Searches that repeat the same negation terms reuse both the occurrences
+    and the KD-trees nearest_negation_distances builds over them.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    csv_mtime (float): Modification time of csv_file
+    negation_terms (tuple): Terms to look for
+    
+    Returns:
+    dict: Number of rows containing each term
+    dict: Occurrences of each term by file, as returned by locate_negation_terms
+    dict: KD-trees over those occurrences, filled in as searches need them
+    """
+    df = read_search_corpus(csv_file, csv_mtime)[0]
+    counts, locations = locate_negation_terms(df, negation_terms)
+    return counts, locations, {}
+
+def load_negation_index(csv_file, negation_terms):
+    """
+    Load the negation term occurrences of a CSV, reusing the cached copy while
+    the CSV is unchanged.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    negation_terms (list): Terms to look for
+    
+    Returns:
+    dict: Number of rows containing each term
+    dict: Occurrences of each term by file, as returned by locate_negation_terms
+    dict: KD-trees over those occurrences, to pass on to nearest_negation_distances
+    """
+    return read_negation_index(csv_file, os.path.getmtime(csv_file), tuple(negation_terms))
 
 def search_documents(search_term, csv_file='big_text_with_position_may12.csv', similarity_threshold=80, 
                    negation_terms=None, negation_distance=100, start_date=None, end_date=None):
@@ -74,182 +296,130 @@ def search_documents(search_term, csv_file='big_text_with_position_may12.csv', s
     
     # Step 1: Get text position data
     try:
-        df = pd.read_csv(csv_file)
-        search_stats = f"Loaded {len(df)} text entries from CSV file"
+        df, corpus_words, positions, duplicate_rows, lowered_text = load_search_corpus(csv_file)
+        stats_lines = [f"Loaded {len(df)} text entries from CSV file"]
     except FileNotFoundError:
         return None, f"Error: {csv_file} not found"
     
     # Step 2: Perform fuzzy search
-    search_stats += f"\nSearching for '{search_term}' with similarity threshold {similarity_threshold}%..."
+    stats_lines.append(f"Searching for '{search_term}' with similarity threshold {similarity_threshold}%...")
     if negation_terms and len(negation_terms) > 0:
-        search_stats += f"\nWill exclude results where any of these terms appears within {negation_distance} units: {', '.join(negation_terms)}"
+        stats_lines.append(f"Will exclude results where any of these terms appears within {negation_distance} units: {', '.join(negation_terms)}")
     
     if start_date or end_date:
-        date_filter_msg = "\nFiltering results by date: "
+        date_filter_msg = "Filtering results by date: "
         if start_date and end_date:
             date_filter_msg += f"from {start_date} to {end_date}"
         elif start_date:
             date_filter_msg += f"from {start_date}"
         elif end_date:
             date_filter_msg += f"until {end_date}"
-        search_stats += date_filter_msg
-    
-    # First try exact substring search for efficiency
-    exact_matches = df[df['text'].str.contains(search_term, case=False, na=False)].copy()
-    search_stats += f"\nFound {len(exact_matches)} exact matches"
+        stats_lines.append(date_filter_msg)
     
-    # Add similarity score of 100 for exact matches
-    exact_matches['similarity'] = 100
+    # First try exact substring search for efficiency; plain terms are looked up
+    # in the lowercased text, so the scan needs no case folding
+    if REGEX_METACHARACTERS.isdisjoint(search_term):
+        exact_matches = lowered_text.str.contains(search_term.lower(), regex=False, na=False)
+    else:
+        exact_matches = df['text'].str.contains(search_term, case=False, na=False)
+    exact_mask = exact_matches.to_numpy(dtype=bool)
+    stats_lines.append(f"Found {exact_mask.sum()} exact matches")
     
     # For remaining entries, use fuzzy matching
-    remaining_df = df.drop(exact_matches.index)
-    search_stats += f"\nPerforming fuzzy matching on {len(remaining_df)} remaining entries..."
-    
-    # Apply fuzzy matching - this is computationally expensive for large datasets
-    fuzzy_matches_chunks = []
-    
-    # Create chunks for processing to avoid memory issues
-    chunk_size = 10000  # Adjust based on your system's memory
-    total_chunks = (len(remaining_df) + chunk_size - 1) // chunk_size
-    
-    for i in range(0, len(remaining_df), chunk_size):
-        chunk = remaining_df.iloc[i:i+chunk_size].copy()
-        
-        # Calculate word-level similarity scores for this chunk
-        chunk['similarity'] = chunk['text'].apply(
-            lambda x: word_level_similarity(search_term, x)
-        )
-        
-        # Find matches above threshold
-        chunk_matches = chunk[chunk['similarity'] >= similarity_threshold]
-        fuzzy_matches_chunks.append(chunk_matches)
-        
-        search_stats += f"\nProcessed chunk {i//chunk_size + 1}/{total_chunks} - found {len(chunk_matches)} matches"
-    
-    # Combine all fuzzy matches from chunks
-    fuzzy_matches = pd.concat(fuzzy_matches_chunks) if fuzzy_matches_chunks else pd.DataFrame()
-    
-    # Combine exact and fuzzy matches
-    search_results = pd.concat([exact_matches, fuzzy_matches]).drop_duplicates()
+    remaining_count = len(df) - exact_mask.sum()
+    stats_lines.append(f"Performing fuzzy matching on {remaining_count} remaining entries...")
+    
+    # Apply fuzzy matching - every distinct word of the corpus is scored in one batched
+    # call, which rapidfuzz spreads over all cores
+    similarities = word_level_similarities(search_term, df['text'], corpus_words, similarity_threshold)
+    fuzzy_mask = ~exact_mask & (similarities >= similarity_threshold)
+    
+    # Report progress in chunks of the remaining entries, as before
+    chunk_size = 10000
+    total_chunks = (remaining_count + chunk_size - 1) // chunk_size
+    remaining_found = fuzzy_mask[~exact_mask]
+    
+    for i in range(0, remaining_count, chunk_size):
+        stats_lines.append(f"Processed chunk {i//chunk_size + 1}/{total_chunks} - found {remaining_found[i:i+chunk_size].sum()} matches")
+    
+    # Combine exact and fuzzy matches by row position: the two sets are disjoint,
+    # so only rows repeating an earlier row of the data need dropping
+    exact_rows = np.flatnonzero(exact_mask & ~duplicate_rows)
+    fuzzy_rows = np.flatnonzero(fuzzy_mask & ~duplicate_rows)
+    search_results = df.iloc[np.concatenate([exact_rows, fuzzy_rows])].copy()
+    search_results['similarity'] = np.concatenate([np.full(len(exact_rows), 100), similarities[fuzzy_rows]])
+    exact_index = df.index[exact_mask]
+    fuzzy_index = df.index[fuzzy_mask]
     
     # Apply negation filtering if negation terms are provided
     if negation_terms and len(negation_terms) > 0 and len(search_results) > 0:
-        search_stats += f"\nChecking for negation terms near matches..."
-        
-        # Create a dictionary to track negation matches by term
-        negation_matches_dict = {}
-        total_negation_matches = 0
+        stats_lines.append(f"Checking for negation terms near matches...")
         
-        # Find occurrences of each negation term
+        # Occurrences of each term, shared with earlier searches using the same terms
+        negation_counts, negation_locations, negation_trees = load_negation_index(csv_file, negation_terms)
         for term in negation_terms:
-            if 'text' in df.columns:
-                # Use word boundaries to match whole words only
-                pattern = r'\b' + re.escape(term) + r'\b'
-                term_matches = df[df['text'].str.contains(pattern, case=False, na=False, regex=True)].copy()
-                negation_matches_dict[term] = term_matches
-                total_negation_matches += len(term_matches)
-                search_stats += f"\n  - Found {len(term_matches)} occurrences of negation term '{term}'"
+            stats_lines.append(f"  - Found {negation_counts[term]} occurrences of negation term '{term}'")
+        total_negation_matches = sum(negation_counts[term] for term in negation_terms)
         
         if total_negation_matches > 0:
-            search_stats += f"\nFound {total_negation_matches} total occurrences of all negation terms"
+            stats_lines.append(f"Found {total_negation_matches} total occurrences of all negation terms")
             
-            # For each search result, check if any negation term is nearby
-            results_to_keep = []
-            excluded_by_term = {term: 0 for term in negation_terms}
+            # For each search result, find the closest negation term within range
+            distances = nearest_negation_distances(search_results, negation_locations,
+                                                   negation_distance, positions, negation_trees)
+            has_nearby_negation = np.isfinite(distances).any(axis=1)
             
-            for idx, row in search_results.iterrows():
-                filename = row['filename']
-                x1, y1 = row['bbx0'], row['bby0']
-                
-                # Check if any negation term is too close
-                has_nearby_negation = False
-                excluding_term = None
-                min_distance = float('inf')
-                
-                # Process each negation term separately
-                for term, term_matches in negation_matches_dict.items():
-                    # Filter negation matches to the same file
-                    file_negations = term_matches[term_matches['filename'] == filename]
-                    
-                    # Look at each negation instance
-                    for neg_idx, neg_row in file_negations.iterrows():
-                        x2, y2 = neg_row['bbx0'], neg_row['bby0']
-                        distance = calculate_distance(x1, y1, x2, y2)
-                        
-                        # If this negation is close enough to exclude the match
-                        if distance <= negation_distance and distance < min_distance:
-                            has_nearby_negation = True
-                            excluding_term = term
-                            min_distance = distance
-                            # Don't break - we want to find the closest negation term
-                    
-                # After checking all terms, record which term excluded this match
-                if not has_nearby_negation:
-                    results_to_keep.append(idx)
-                elif excluding_term:
-                    excluded_by_term[excluding_term] += 1
+            # The closest term excludes the match; ties go to the term listed first
+            excluding_terms = distances[has_nearby_negation].argmin(axis=1)
+            term_counts = np.bincount(excluding_terms, minlength=len(negation_locations))
+            excluded_by_term = {term: 0 for term in negation_terms}
+            excluded_by_term.update(zip(negation_locations, term_counts.tolist()))
             
             # Keep only results without nearby negation terms
-            search_results = search_results.loc[results_to_keep]
-            search_stats += f"\nAfter negation filtering: {len(search_results)} matches remain"
+            search_results = search_results[~has_nearby_negation]
+            stats_lines.append(f"After negation filtering: {len(search_results)} matches remain")
             
             # Print negation term statistics
             for term, count in excluded_by_term.items():
                 if count > 0:
-                    search_stats += f"\n  - Term '{term}' excluded {count} matches"
+                    stats_lines.append(f"  - Term '{term}' excluded {count} matches")
     
     if len(search_results) == 0:
         return None, f"No results found for '{search_term}'"
     
-    search_stats += f"\nFound total of {len(search_results)} occurrences - {len(exact_matches.index.intersection(search_results.index))} exact matches and {len(fuzzy_matches.index.intersection(search_results.index))} fuzzy matches"
+    stats_lines.append(f"Found total of {len(search_results)} occurrences - {len(exact_index.intersection(search_results.index))} exact matches and {len(fuzzy_index.intersection(search_results.index))} fuzzy matches")
     
     # Ensure we have date and page_number columns for sorting
     # If they don't exist, try to extract them from filename
     if 'date' not in search_results.columns:
         # Try to extract date from filename
-        search_results['date'] = search_results['filename'].str.extract(r'(\d{4}-\d{2}-\d{2})')
+        search_results['date'] = search_results['filename'].str.extract(r'(\d{4}-\d{2}-\d{2})', expand=False)
     
-    # Convert date to datetime for proper sorting and filtering
+    # Convert date to datetime for proper sorting and filtering (the corpus
+    # loader already parses a date column; dates from filenames are parsed here)
     if 'date' in search_results.columns:
+        if not pd.api.types.is_datetime64_any_dtype(search_results['date']):
+            search_results['date'] = parse_dates(search_results['date'])
+        
         try:
-            search_results['date'] = pd.to_datetime(search_results['date'])
-            
             # Apply date filtering if specified
             original_count = len(search_results)
+            in_range = np.ones(original_count, dtype=bool)
             
             if start_date:
-                start_dt = pd.to_datetime(start_date)
-                search_results = search_results[search_results['date'] >= start_dt]
+                in_range &= (search_results['date'] >= pd.to_datetime(start_date)).to_numpy()
                 
             if end_date:
-                end_dt = pd.to_datetime(end_date)
-                search_results = search_results[search_results['date'] <= end_dt]
+                in_range &= (search_results['date'] <= pd.to_datetime(end_date)).to_numpy()
+            
+            search_results = search_results[in_range]
                 
             if (start_date or end_date) and len(search_results) < original_count:
-                search_stats += f"\nDate filtering removed {original_count - len(search_results)} results"
-                search_stats += f"\nRemaining after date filtering: {len(search_results)} results"
-                
-        except:
-            try:
-                search_results['date'] = pd.to_datetime(search_results['date'], format='%Y-%m-%d', errors='coerce')
-                
-                # Apply date filtering if specified
-                original_count = len(search_results)
+                stats_lines.append(f"Date filtering removed {original_count - len(search_results)} results")
+                stats_lines.append(f"Remaining after date filtering: {len(search_results)} results")
                 
-                if start_date:
-                    start_dt = pd.to_datetime(start_date)
-                    search_results = search_results[search_results['date'] >= start_dt]
-                    
-                if end_date:
-                    end_dt = pd.to_datetime(end_date)
-                    search_results = search_results[search_results['date'] <= end_dt]
-                    
-                if (start_date or end_date) and len(search_results) < original_count:
-                    search_stats += f"\nDate filtering removed {original_count - len(search_results)} results"
-                    search_stats += f"\nRemaining after date filtering: {len(search_results)} results"
-                    
-            except:
-                search_stats += "\nWarning: Could not convert date column to datetime for filtering"
+        except (ValueError, TypeError):
+            stats_lines.append("Warning: Could not convert date column to datetime for filtering")
     
     # If we have no results after date filtering, return None
     if len(search_results) == 0:
@@ -257,8 +427,11 @@ def search_documents(search_term, csv_file='big_text_with_position_may12.csv', s
     
     # Ensure we have page numbers
     if 'page_number' not in search_results.columns:
-        # Try to extract page number from filename
-        search_results['page_number'] = search_results['filename'].str.extract(r'Page(\d+)').astype(int, errors='ignore')
+        # Try to extract page number from filename, as a nullable integer so that
+        # filenames without one don't turn the whole column into strings
+        search_results['page_number'] = pd.to_numeric(
+            search_results['filename'].str.extract(r'Page(\d+)', expand=False), errors='coerce'
+        ).astype('Int64')
     
     # Sort by date and page number for final ordering
     if 'date' in search_results.columns and pd.api.types.is_datetime64_dtype(search_results['date']):
@@ -278,7 +451,7 @@ def search_documents(search_term, csv_file='big_text_with_position_may12.csv', s
     if 'date' in search_results.columns and pd.api.types.is_datetime64_dtype(search_results['date']):
         search_results['date'] = search_results['date'].dt.strftime('%Y-%m-%d')
     
-    return search_results, search_stats
+    return search_results, "\n".join(stats_lines)
 
 def save_search_results(search_results, search_term, negation_terms=None, output_directory='.', date_range_str=""):
     """
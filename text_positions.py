@@ -0,0 +1,209 @@
+import os
+import functools
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# PyArrow is optional; when available the text column is kept as Arrow-backed strings
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Dtypes for the text position columns. Filenames repeat on every row of a page,
+# so the parser turns them into category codes chunk by chunk. Page numbers are
+# nullable so blank ones load as missing; the coordinates stay float64, since the
+# CSVs store them with four decimals, which float32 cannot hold. Dates are read
+# as strings and parsed by parse_dates.
+TEXT_POSITION_DTYPES = {
+    'filename': 'category',
+    'page_number': 'Int64',
+    'date': 'str',
+    'bbx0': 'float64', 'bby0': 'float64', 'bbx1': 'float64', 'bby1': 'float64',
+}
+
+# Files with at most this many result/negation pairs use a dense distance matrix
+# instead of building a KD-tree
+DENSE_DISTANCE_LIMIT = 250_000
+
+def parse_dates(dates):
+    """
+    Parse YYYY-MM-DD date strings, turning anything else into NaT.
+    
+    Parameters:
+    dates (Series): Date strings
+    
+    Returns:
+    Series: Parsed dates
+    """
+    return pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce', cache=True)
+
+def arrow_text(texts):
+    """
+    Store a text column as Arrow-backed strings, so that str.contains runs
+    on PyArrow's compute kernels instead of looping over Python objects.
+    
+    Parameters:
+    texts (Series): Text column
+    
+    Returns:
+    Series: The same text, Arrow-backed when PyArrow is available
+    """
+    if pyarrow is None:
+        return texts
+    if isinstance(texts.dtype, pd.StringDtype) and texts.dtype.storage == 'pyarrow':
+        return texts
+    return texts.astype(pd.StringDtype('pyarrow'))
+
+def text_positions_parquet(csv_file):
+    """
+    Path of the Parquet copy of a text position CSV, stored next to it.
+    """
+    return os.path.splitext(csv_file)[0] + '.text_positions.parquet'
+
+@functools.lru_cache(maxsize=1)
+def read_text_positions(csv_file, csv_mtime):
+    """
+    Read text position data, preferring an up-to-date Parquet copy of the CSV.
+    
+    The first read of a CSV writes the copy next to it, with the repeated
+    filenames stored as a category column and the dates already parsed (taken
+    from the filenames when the CSV has no date column). The CSV modification
+    time is part of the cache key, so editing the CSV invalidates both the
+    in-process cache and the Parquet copy.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    csv_mtime (float): Modification time of csv_file
+    
+    Returns:
+    DataFrame: Text position data (shared between calls, so not modified in place)
+    """
+    parquet_file = text_positions_parquet(csv_file)
+    df = None
+    
+    if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= csv_mtime:
+        try:
+            df = pd.read_parquet(parquet_file)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Warning: Could not read {parquet_file}: {e}")
+    
+    if df is None:
+        df = pd.read_csv(csv_file, dtype=TEXT_POSITION_DTYPES)
+        # Categories merged from several chunks come out in no particular order;
+        # sort them so that category codes order filenames alphabetically
+        df['filename'] = df['filename'].cat.reorder_categories(df['filename'].cat.categories.sort_values())
+        
+        if 'date' not in df.columns:
+            df['date'] = df['filename'].str.extract(r'(\d{4}-\d{2}-\d{2})', expand=False)
+        df['date'] = parse_dates(df['date'])
+        
+        try:
+            df.to_parquet(parquet_file, compression='zstd')
+        except (ImportError, OSError) as e:
+            # No Parquet engine or no write access; keep working from the CSV
+            print(f"Warning: Could not cache {csv_file} as Parquet: {e}")
+    
+    df['text'] = arrow_text(df['text'])
+    return df
+
+def load_text_positions(csv_file):
+    """
+    Load text position data, reusing the cached copy while the CSV is unchanged.
+    
+    Parameters:
+    csv_file (str): CSV file with text position data
+    
+    Returns:
+    DataFrame: Text position data (shared between calls, so not modified in place)
+    """
+    return read_text_positions(csv_file, os.path.getmtime(csv_file))
+
+def positions_by_file(rows):
+    """
+    Group the (bbx0, bby0) positions of rows by file, leaving out missing ones.
+    
+    Parameters:
+    rows (DataFrame): Rows with 'filename', 'bbx0' and 'bby0' columns
+    
+    Returns:
+    dict: Mapping of filename to an (n, 2) array of positions
+    """
+    xy = rows[['bbx0', 'bby0']].to_numpy(dtype=float)
+    finite = np.isfinite(xy).all(axis=1)
+    filenames = rows['filename'][finite]
+    return {
+        filename: xy[finite][file_rows]
+        for filename, file_rows in filenames.groupby(filenames, sort=False, observed=True).indices.items()
+    }
+
+def nearest_negation_distances(search_results, negation_locations, negation_distance, positions=None,
+                               trees=None):
+    """
+    Measure how far each search result is from the nearest occurrence of each negation term.
+    
+    Per term and file, small cases compare squared distances in a dense NumPy
+    matrix; larger ones index the negation occurrences in a KD-tree and answer
+    all of the file's results with a single radius-bounded query.
+    
+    Parameters:
+    search_results (DataFrame): Matches with 'filename', 'bbx0' and 'bby0' columns
+    negation_locations (dict): For each negation term, a mapping of filename to
+                               the (n, 2) array of its occurrences, as returned
+                               by positions_by_file
+    negation_distance (float): Maximum distance to consider for negation
+    positions (ndarray): Optional (bbx0, bby0) array of the data the results
+                         were selected from, looked up by index label instead
+                         of reading the columns
+    trees (dict): Optional KD-trees by (term, filename) kept from earlier
+                  calls; trees built here are added to it
+    
+    Returns:
+    ndarray: One row per search result and one column per negation term, holding
+             the distance to the nearest occurrence in the same file, or inf if
+             there is none within negation_distance
+    """
+    distances = np.full((len(search_results), len(negation_locations)), np.inf)
+    if positions is not None:
+        result_xy = positions[search_results.index]
+    else:
+        result_xy = search_results[['bbx0', 'bby0']].to_numpy(dtype=float)
+    result_rows = {
+        filename: rows[np.isfinite(result_xy[rows]).all(axis=1)]
+        for filename, rows in search_results.groupby('filename', sort=False, observed=True).indices.items()
+    }
+    
+    # The tree only returns neighbours strictly closer than the bound, so nudge it
+    # up to keep negations lying exactly at negation_distance
+    upper_bound = np.nextafter(negation_distance, np.inf)
+    
+    for term_index, (term, file_locations) in enumerate(negation_locations.items()):
+        # Only files with search results matter
+        for filename, rows in result_rows.items():
+            negation_xy = file_locations.get(filename)
+            if negation_xy is None or len(rows) == 0 or len(negation_xy) == 0:
+                continue
+            
+            if len(rows) * len(negation_xy) <= DENSE_DISTANCE_LIMIT:
+                # Few pairs: broadcast all squared distances in place (no (n, m, 2)
+                # temporary), and take the root of each row's minimum only
+                squared = np.subtract.outer(result_xy[rows, 0], negation_xy[:, 0])
+                squared *= squared
+                dy = np.subtract.outer(result_xy[rows, 1], negation_xy[:, 1])
+                dy *= dy
+                squared += dy
+                nearest = np.sqrt(squared.min(axis=1))
+                nearest[nearest > negation_distance] = np.inf
+            else:
+                tree = trees.get((term, filename)) if trees is not None else None
+                if tree is None:
+                    tree = cKDTree(negation_xy)
+                    if trees is not None:
+                        trees[(term, filename)] = tree
+                # Large cases only, so spreading the queries over all cores pays off
+                nearest, _ = tree.query(result_xy[rows], k=1, distance_upper_bound=upper_bound,
+                                        workers=-1)
+            
+            distances[rows, term_index] = nearest
+    
+    return distances
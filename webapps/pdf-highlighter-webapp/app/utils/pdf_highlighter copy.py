@@ -1,9 +1,12 @@
 import os
 import pandas as pd
 import pymupdf  # PyMuPDF
-from pypdf import PdfWriter
 import uuid
 
+# Characters that give a search term a regex meaning; terms without any of them
+# are matched as plain text against the lowercased text
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
 class PDFHighlighter:
     def __init__(self, app_config):
         """Initialize with application configuration"""
@@ -22,6 +25,8 @@ class PDFHighlighter:
         """Load text position data from CSV"""
         try:
             self.text_position_df = pd.read_csv(self.text_position_csv)
+            # Lowercase the text once for all searches
+            self.text_lower = self.text_position_df['text'].str.lower()
             self.data_loaded = True
         except FileNotFoundError:
             self.data_loaded = False
@@ -45,55 +50,46 @@ class PDFHighlighter:
         output_filename = f"highlighted_{search_term.replace(' ', '_')}_{search_id}.pdf"
         output_pdf_path = os.path.join(self.output_dir, output_filename)
         
-        # Search for the term
-        search_results = self.text_position_df[
-            self.text_position_df['text'].str.contains(search_term, case=False, na=False)
-        ]
+        # Search for the term; plain terms are looked up in the lowercased text
+        if REGEX_METACHARACTERS.isdisjoint(search_term):
+            matches = self.text_lower.str.contains(search_term.lower(), regex=False, na=False)
+        else:
+            matches = self.text_position_df['text'].str.contains(search_term, case=False, na=False)
+        search_results = self.text_position_df[matches]
         
         if len(search_results) == 0:
             return None, f"No results found for '{search_term}'"
         
-        # Create PDF with highlights
-        pdf_writer = PdfWriter()
+        # Create PDF with highlights, opening each PDF once for all of its hits
+        output_doc = pymupdf.open()
         processed_files = set()
         search_results = search_results.sort_values(by=['date', 'page_number'])
         
-        for index, row in search_results.iterrows():
-            pdf_path = os.path.join(self.pdf_dir, row['filename'])
-            
-            if not os.path.exists(pdf_path):
-                continue
-            
-            file_id = (pdf_path, 0)  # Assuming single-page PDFs
-            
-            if file_id in processed_files:
-                continue
-            
-            try:
-                doc = pymupdf.open(pdf_path)
-                page = doc[0]  # Single-page PDFs
-                rect = pymupdf.Rect(row['bbx0'], row['bby0'], row['bbx1'], row['bby1'])
-                highlight = page.add_highlight_annot(rect)
+        try:
+            for filename, file_results in search_results.groupby('filename', sort=False):
+                pdf_path = os.path.join(self.pdf_dir, filename)
                 
-                temp_path = os.path.join(self.output_dir, f"_tmp_{search_id}_{index}.pdf")
-                doc.save(temp_path, incremental=False)
-                doc.close()
+                if not os.path.exists(pdf_path):
+                    continue
                 
-                pdf_writer.append(temp_path)
-                processed_files.add(file_id)
-            except Exception as e:
-                continue
-        
-        if len(processed_files) == 0:
-            return None, "Could not process any PDFs for highlighting"
-        
-        pdf_writer.write(output_pdf_path)
-        
-        # Clean up temporary files
-        for index in range(len(search_results)):
-            temp_path = os.path.join(self.output_dir, f"_tmp_{search_id}_{index}.pdf")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+                try:
+                    with pymupdf.open(pdf_path) as doc:
+                        page = doc[0]  # Single-page PDFs
+                        for bbox in file_results[['bbx0', 'bby0', 'bbx1', 'bby1']].to_numpy(dtype=float):
+                            page.add_highlight_annot(pymupdf.Rect(*bbox))
+                        
+                        # Append in memory instead of through a temporary file
+                        output_doc.insert_pdf(doc)
+                    processed_files.add((pdf_path, 0))
+                except Exception as e:
+                    continue
+            
+            if len(processed_files) == 0:
+                return None, "Could not process any PDFs for highlighting"
+            
+            output_doc.save(output_pdf_path, garbage=4, deflate=True)
+        finally:
+            output_doc.close()
         
         # Return the relative path for URL generation
         relative_path = os.path.relpath(output_pdf_path, start=self.output_dir)
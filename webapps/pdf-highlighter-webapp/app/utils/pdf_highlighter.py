@@ -1,7 +1,6 @@
 import os
 import pandas as pd
 import pymupdf  # PyMuPDF
-from pypdf import PdfWriter
 
 def search_and_highlight(search_term, base_folder, output_directory='.'):
     try:
@@ -15,39 +14,33 @@ def search_and_highlight(search_term, base_folder, output_directory='.'):
         return None, f"No results found for '{search_term}'"
     
     output_pdf_path = os.path.join(output_directory, f"highlighted_{search_term.replace(' ', '_')}.pdf")
-    pdf_writer = PdfWriter()
+    output_doc = pymupdf.open()
     processed_files = set()
     search_results = search_results.sort_values(by=['date', 'page_number'])
     
-    for index, row in search_results.iterrows():
-        pdf_path = os.path.join(base_folder, row['filename'])
-        
-        if not os.path.exists(pdf_path):
-            continue
-        
-        file_id = (pdf_path, 0)
+    try:
+        # Open each PDF once and add all of its highlights
+        for filename, file_results in search_results.groupby('filename', sort=False):
+            pdf_path = os.path.join(base_folder, filename)
+            
+            if not os.path.exists(pdf_path):
+                continue
+            
+            try:
+                with pymupdf.open(pdf_path) as doc:
+                    page = doc[0]
+                    for bbox in file_results[['bbx0', 'bby0', 'bbx1', 'bby1']].to_numpy(dtype=float):
+                        page.add_highlight_annot(pymupdf.Rect(*bbox))
+                    output_doc.insert_pdf(doc)
+                processed_files.add((pdf_path, 0))
+            except Exception as e:
+                continue
         
-        if file_id in processed_files:
-            continue
+        if len(processed_files) == 0:
+            return None, "Could not process any PDFs for highlighting"
         
-        try:
-            doc = pymupdf.open(pdf_path)
-            page = doc[0]
-            rect = pymupdf.Rect(row['bbx0'], row['bby0'], row['bbx1'], row['bby1'])
-            highlight = page.add_highlight_annot(rect)
-            temp_path = f"_tmp_{index}.pdf"
-            doc.save(temp_path, incremental=False)
-            doc.close()
-            pdf_writer.append(temp_path)
-            processed_files.add(file_id)
-        except Exception as e:
-            continue
-    
-    pdf_writer.write(output_pdf_path)
-    
-    for index in range(len(search_results)):
-        temp_path = f"_tmp_{index}.pdf"
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        output_doc.save(output_pdf_path, garbage=4, deflate=True)
+    finally:
+        output_doc.close()
     
     return output_pdf_path, f"Created PDF with {len(processed_files)} highlighted pages."
\ No newline at end of file